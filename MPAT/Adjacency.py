@@ -1,6 +1,7 @@
 import os
+import numpy as np
 import pandas as pd
-import networkx as nx
+import scipy.sparse
 
 
 class AdjacencyMatrix:
@@ -49,17 +50,44 @@ class AdjacencyMatrix:
         Returns:
         - List of tuples derived from unique pairs of values in the DataFrame.
         """
-        all_tuples = list(df.itertuples(index=False, name=None))
-        final_tuples = []
-        for tpl in all_tuples:
-            if (tpl[1], tpl[0]) not in final_tuples and tpl[1] != tpl[0]:
-                final_tuples.append((str(tpl[0]), str(tpl[1])))
+        pairs = df.to_numpy().astype(str)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]] # drop self-loops
+        
+        # Keep the first occurrence of each unordered pair, in its original order and orientation
+        _, first_index = np.unique(np.sort(pairs, axis=1), axis=0, return_index=True)
+        final_tuples = list(map(tuple, pairs[np.sort(first_index)].tolist()))
         return final_tuples
     
-    def generate_adjacency_matrix(self):
+    def tuples_to_adjacency_matrix(self, GEOID_tuples, sparse=False):
+        """
+        Builds the symmetric adjacency matrix of the edge tuples directly from their index codes.
+        
+        Parameters:
+        - GEOID_tuples: List of unique (GEOID, neighbor GEOID) tuples.
+        - sparse: Boolean flag indicating whether to return a sparse DataFrame (default False).
+        
+        Returns:
+        - Pandas DataFrame representing the adjacency matrix, with GEOIDs in order of first appearance.
+        """
+        # Integer code of every GEOID, numbered in order of first appearance
+        codes, GEOIDs = pd.factorize(np.asarray(GEOID_tuples, dtype=str).ravel())
+        codes = codes.reshape(-1, 2)
+        n = len(GEOIDs)
+        
+        A = scipy.sparse.coo_matrix((np.ones(len(codes)), (codes[:, 0], codes[:, 1])), shape=(n, n))
+        A = (A + A.T).tocsr()
+        
+        if sparse:
+            return pd.DataFrame.sparse.from_spmatrix(A.astype(int), index=GEOIDs, columns=GEOIDs) # integer entries keep 0 as the fill value
+        return pd.DataFrame(A.toarray(), index=GEOIDs, columns=GEOIDs)
+    
+    def generate_adjacency_matrix(self, sparse=False):
         """
         Generates the adjacency matrix from the input adjacency file.
         
+        Parameters:
+        - sparse: Boolean flag indicating whether to return a sparse DataFrame (default False).
+        
         Returns:
         - Pandas DataFrame representing the adjacency matrix.
         """
@@ -74,10 +102,7 @@ class AdjacencyMatrix:
                 # Create tuples for easier handling in creating the graph
                 GEOID_tuples = self.create_tuples(adj_df[['County GEOID', 'Neighbor GEOID']])
                 
-                G = nx.Graph()  # Initialize graph
-                G.add_edges_from(GEOID_tuples)  # Add the edges 
-
-                adj_matrix = nx.to_pandas_adjacency(G) # creates adjacency matrix as a pandas dataframe
+                adj_matrix = self.tuples_to_adjacency_matrix(GEOID_tuples, sparse=sparse) # creates adjacency matrix as a pandas dataframe
                 return adj_matrix
             
             except FileNotFoundError:
@@ -97,10 +122,7 @@ class AdjacencyMatrix:
                 # Create tuples for easier handling in creating the graph
                 GEOID_tuples = self.create_tuples(adj_df[['County GEOID', 'Neighbor GEOID']])
                 
-                G = nx.Graph()  # Initialize graph
-                G.add_edges_from(GEOID_tuples)  # Add the edges 
-
-                adj_matrix = nx.to_pandas_adjacency(G) #creates adjacency matrix as a pandas dataframe
+                adj_matrix = self.tuples_to_adjacency_matrix(GEOID_tuples, sparse=sparse) # creates adjacency matrix as a pandas dataframe
                 return adj_matrix
             
             except FileNotFoundError:
@@ -1,22 +1,34 @@
 import os
 import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 
 
 class CSVFileReader:
-    def __init__(self, folder_path):
+    def __init__(self, folder_path, lazy=False, max_cached=8):
         """
         Initialize the CSVFileReader with the path to the folder containing CSV files.
 
         Parameters:
         folder_path (str): The path to the folder containing CSV files.
+        lazy (bool, optional): If True, only scan the folder and load each CSV file when it is first requested. Defaults to False.
+        max_cached (int, optional): Maximum number of DataFrames kept in memory when lazy is True, at least 1. Defaults to 8.
         """
+        # The cache must hold at least the frame being returned
+        if lazy and max_cached < 1:
+            raise ValueError("max_cached must be at least 1 when lazy is True.")
         self.folder_path = folder_path
-        self.dataframes = {}  # Dictionary to store DataFrames with file names as keys
+        self.lazy = lazy
+        self.max_cached = max_cached
+        self.dataframes = OrderedDict() if lazy else {}  # Dictionary to store DataFrames with file names as keys
+        self._keys = []  # File names in load order for lookup by index
+        self._paths = {}  # File name to full path of every CSV file found
     
     def read_csv_files_to_dataframe(self):
         """
         Read all CSV files in the specified folder into DataFrames and store them in a dictionary.
+        If lazy is True, the folder is only scanned and the dictionary is filled on demand by get_dataframe_by_index.
 
         Returns:
         dict: A dictionary where keys are file names and values are DataFrames.
@@ -26,26 +38,48 @@ class CSVFileReader:
             print("Folder not found.")
             return None
         
-        # Get a list of all files in the folder
-        files = os.listdir(self.folder_path)
-        
-        # Filter out only CSV files
-        csv_files = [file for file in files if file.endswith('.csv')]
+        # Get the CSV files in the folder in a single directory scan
+        with os.scandir(self.folder_path) as entries:
+            csv_files = [entry.name for entry in entries if entry.is_file() and entry.name.endswith('.csv')]
         
         # If no CSV files found
         if not csv_files:
             print("No CSV files found in the folder.")
             return None
         
-        # Iterate over each CSV file and read it into a DataFrame with semicolon as delimiter
-        for csv_file in csv_files:
-            csv_file_path = os.path.join(self.folder_path, csv_file)
-            df = pd.read_csv(csv_file_path, delimiter=';')
-            # Use the CSV file name as the key for easy reference
+        self._keys = csv_files
+        self._paths = {csv_file: os.path.join(self.folder_path, csv_file) for csv_file in csv_files}
+        if self.lazy:
+            return self.dataframes
+        
+        # Read the CSV files in parallel; the C parser releases the GIL while parsing
+        with ThreadPoolExecutor(max_workers=min(32, len(csv_files))) as executor:
+            dfs = list(executor.map(self._read_csv_file, csv_files))
+        
+        # Use the CSV file name as the key for easy reference
+        for csv_file, df in zip(csv_files, dfs):
             self.dataframes[csv_file] = df
         
         return self.dataframes
     
+    def _read_csv_file(self, csv_file):
+        """
+        Read a single CSV file from the folder into a DataFrame with semicolon as delimiter.
+
+        Parameters:
+        csv_file (str): The name of the CSV file in the folder.
+
+        Returns:
+        DataFrame: The contents of the CSV file.
+        """
+        csv_file_path = self._paths[csv_file]
+        try:
+            # PyArrow parses with multiple threads and keeps Arrow-backed columns
+            return pd.read_csv(csv_file_path, delimiter=';', engine='pyarrow', dtype_backend='pyarrow')
+        except ImportError:
+            # Fall back to the C parser if pyarrow is not installed
+            return pd.read_csv(csv_file_path, delimiter=';', engine='c')
+    
     def get_dataframe_by_index(self, index):
         """
         Retrieve a DataFrame by its index in the dictionary.
@@ -56,16 +90,23 @@ class CSVFileReader:
         Returns:
         DataFrame: The DataFrame corresponding to the specified index, or None if index is invalid.
         """
-        # Get the keys of the dictionary
-        df_keys = list(self.dataframes.keys())
-        
-        # Check if index is valid
-        if index < 0 or index >= len(df_keys):
+        # Check if index is valid against the keys cached at load time
+        if index < 0 or index >= len(self._keys):
             print("Invalid index.")
             return None
         
         # Get the DataFrame using the index
-        selected_key = df_keys[index]
+        selected_key = self._keys[index]
+        if not self.lazy:
+            return self.dataframes[selected_key]
+        
+        # Lazy mode: serve from the bounded cache, loading and evicting the least recently used frame as needed
+        if selected_key in self.dataframes:
+            self.dataframes.move_to_end(selected_key)
+        else:
+            self.dataframes[selected_key] = self._read_csv_file(selected_key)
+            while len(self.dataframes) > self.max_cached:
+                self.dataframes.popitem(last=False)
         return self.dataframes[selected_key]
     
     def save_dataframe_to_csv(self, index, save_path):
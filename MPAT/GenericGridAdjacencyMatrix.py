@@ -1,44 +1,91 @@
+import numpy as np
+import scipy.sparse
+
+
 class GenericGridAdjacencyMatrix:
     @staticmethod
-    def rook_adjacency_matrix(number_of_patches):
-        rook_adj_matrix = np.zeros((number_of_patches**2, number_of_patches**2), dtype=int)
-
-        for i in range(number_of_patches):
-            for j in range(number_of_patches):
-                idx = i * number_of_patches + j
-                if i > 0:
-                    rook_adj_matrix[idx, idx - number_of_patches] = 1  # Up
-                if i < number_of_patches - 1:
-                    rook_adj_matrix[idx, idx + number_of_patches] = 1  # Down
-                if j > 0:
-                    rook_adj_matrix[idx, idx - 1] = 1  # Left
-                if j < number_of_patches - 1:
-                    rook_adj_matrix[idx, idx + 1] = 1  # Right
-
-        return rook_adj_matrix
+    def _neighbor_pairs(number_of_patches, queen=False):
+        # Index pairs (idx, neighbor) of each edge in one direction only, for a row-major grid of patches
+        idx = np.arange(number_of_patches**2)
+        row, col = np.divmod(idx, number_of_patches)
+
+        down = idx[row < number_of_patches - 1]
+        right = idx[col < number_of_patches - 1]
+        sources = [down, right]
+        targets = [down + number_of_patches, right + 1]
+
+        if queen:
+            down_left = idx[(row < number_of_patches - 1) & (col > 0)]
+            down_right = idx[(row < number_of_patches - 1) & (col < number_of_patches - 1)]
+            sources += [down_left, down_right]
+            targets += [down_left + number_of_patches - 1, down_right + number_of_patches + 1]
+
+        return np.concatenate(sources), np.concatenate(targets)
+
+    @staticmethod
+    def _adjacency_matrix(number_of_patches, queen=False, sparse=False):
+        # Symmetric adjacency matrix from the one-directional neighbor pairs, dense or CSR
+        # Entries are only 0/1, so int8 keeps the matrix 8x smaller than the default int64
+        sources, targets = GenericGridAdjacencyMatrix._neighbor_pairs(number_of_patches, queen=queen)
+        n = number_of_patches**2
+
+        if sparse:
+            rows = np.concatenate([sources, targets])
+            cols = np.concatenate([targets, sources])
+            return scipy.sparse.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+
+        # Dense matrices are filled in place, skipping the COO to CSR sort
+        adj_matrix = np.zeros((n, n), dtype=np.int8)
+        adj_matrix[sources, targets] = 1
+        adj_matrix[targets, sources] = 1
+        return adj_matrix
 
     @staticmethod
-    def queen_adjacency_matrix(number_of_patches):
-        queen_adj_matrix = np.zeros((number_of_patches**2, number_of_patches**2), dtype=int)
-
-        for i in range(number_of_patches):
-            for j in range(number_of_patches):
-                idx = i * number_of_patches + j
-                if i > 0:
-                    queen_adj_matrix[idx, idx - number_of_patches] = 1  # Up
-                if i < number_of_patches - 1:
-                    queen_adj_matrix[idx, idx + number_of_patches] = 1  # Down
-                if j > 0:
-                    queen_adj_matrix[idx, idx - 1] = 1  # Left
-                if j < number_of_patches - 1:
-                    queen_adj_matrix[idx, idx + 1] = 1  # Right
-                if i > 0 and j > 0:
-                    queen_adj_matrix[idx, idx - number_of_patches - 1] = 1  # Up-Left
-                if i > 0 and j < number_of_patches - 1:
-                    queen_adj_matrix[idx, idx - number_of_patches + 1] = 1  # Up-Right
-                if i < number_of_patches - 1 and j > 0:
-                    queen_adj_matrix[idx, idx + number_of_patches - 1] = 1  # Down-Left
-                if i < number_of_patches - 1 and j < number_of_patches - 1:
-                    queen_adj_matrix[idx, idx + number_of_patches + 1] = 1  # Down-Right
-
-        return queen_adj_matrix
+    def rook_adjacency_matrix(number_of_patches, sparse=False):
+        # Up/Down and Left/Right neighbors
+        return GenericGridAdjacencyMatrix._adjacency_matrix(number_of_patches, sparse=sparse)
+
+    @staticmethod
+    def queen_adjacency_matrix(number_of_patches, sparse=False):
+        # Rook neighbors plus the four diagonals
+        return GenericGridAdjacencyMatrix._adjacency_matrix(number_of_patches, queen=True, sparse=sparse)
+
+    @staticmethod
+    def offset_adjacency_matrix(cols, rows, offsets, odd_row_offsets=None, sparse=False):
+        # Cells at integer lattice positions (cols, rows), which may be any subset of the lattice, are neighbors
+        # when one is a (column, row) offset away from the other; odd rows use odd_row_offsets if given (hexagonal grids).
+        # The offsets are expected to be symmetric, so every edge can be found from either of its cells
+        cols, rows = np.asarray(cols, dtype=int), np.asarray(rows, dtype=int)
+        n = len(cols)
+        odd_row_offsets = offsets if odd_row_offsets is None else odd_row_offsets
+        if n == 0:
+            return scipy.sparse.csr_matrix((0, 0), dtype=np.int8) if sparse else np.zeros((0, 0), dtype=np.int8)
+
+        # Position of every cell in a lookup table over the lattice, -1 where there is no cell
+        # Rows are shifted by an even amount so that every row keeps its parity (and so its offsets)
+        cols, rows = cols - cols.min(), rows - (rows.min() - rows.min() % 2)
+        lookup = np.full((cols.max() + 1, rows.max() + 1), -1)
+        lookup[cols, rows] = np.arange(n)
+
+        sources, targets = [], []
+        for parity, parity_offsets in ((0, offsets), (1, odd_row_offsets)):
+            idx = np.flatnonzero(rows % 2 == parity)
+            for col_offset, row_offset in parity_offsets:
+                neighbor_cols, neighbor_rows = cols[idx] + col_offset, rows[idx] + row_offset
+                inside = (neighbor_cols >= 0) & (neighbor_cols < lookup.shape[0]) & (neighbor_rows >= 0) & (neighbor_rows < lookup.shape[1])
+                neighbors = lookup[neighbor_cols[inside], neighbor_rows[inside]]
+                # Keep each edge in one direction only (the other is found from the neighbor), then mirror once below
+                keep = neighbors > idx[inside]
+                sources.append(idx[inside][keep])
+                targets.append(neighbors[keep])
+        sources, targets = np.concatenate(sources), np.concatenate(targets)
+
+        if sparse:
+            matrix_rows = np.concatenate([sources, targets])
+            matrix_cols = np.concatenate([targets, sources])
+            return scipy.sparse.csr_matrix((np.ones(len(matrix_rows), dtype=np.int8), (matrix_rows, matrix_cols)), shape=(n, n))
+
+        adj_matrix = np.zeros((n, n), dtype=np.int8)
+        adj_matrix[sources, targets] = 1
+        adj_matrix[targets, sources] = 1
+        return adj_matrix
@@ -1,11 +1,51 @@
 import numpy as np
 import pandas as pd
-from itertools import product
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None # falls back to pandas' CSV writer
+
+
+def _format_float(value):
+    """
+    Purpose:
+    Format a float the way PyArrow's CSV writer does, so that the pandas fallback writes the same file.
+    
+    Inputs:
+    - value: Float value of a tensor column
+    
+    Outputs:
+    String with the shortest representation of the value, in positional notation between 1e-6 and 1e10.
+    """
+    if value == 0 or 1e-6 <= abs(value) < 1e10:
+        return np.format_float_positional(value, unique=True, trim='-')
+    return np.format_float_scientific(value, unique=True, trim='-', exp_digits=1)
+
+
+def _fill_product(values, num_patches, out):
+    """
+    Purpose:
+    Fill a preallocated array with every combination of values across patches.
+
+    Inputs:
+    - values: 1-D numpy array of parameter values
+    - num_patches: Integer representing the number of patches
+    - out: Numpy array of shape (len(values)**num_patches, num_patches) to fill
+
+    Outputs:
+    The filled out array, in the same row order as itertools.product.
+    """
+    num_values = len(values)
+    for j in range(num_patches):
+        out[:, j] = np.tile(np.repeat(values, num_values ** (num_patches - 1 - j)), num_values ** j)
+    return out
 
-from InfLayers import InfLayers
 
 class HyperParameters:
-    def __init__(self, beta_values, gamma_values, delta_values, time_steps, num_patches, start_noise_at=None, noise_mean=0, noise_std=0.1):
+    def __init__(self, beta_values, gamma_values, delta_values, time_steps, num_patches, start_noise_at=None, noise_mean=0, noise_std=0.1, seed=None):
         """
         Purpose:
         Initializes the CombinedParameters object with given values.
@@ -19,37 +59,45 @@ class HyperParameters:
         - start_noise_at: Optional integer indicating starting time step for noise addition
         - noise_mean: Mean of noise (default: 0)
         - noise_std: Standard deviation of noise (default: 0.1)
+        - seed: Optional seed of the random generator used for the noise, for reproducible tensors (default: None)
         
         Outputs:
         None
         """
-        self.beta_values = beta_values
-        self.gamma_values = gamma_values
-        self.delta_values = delta_values
+        self.beta_values = np.asarray(beta_values, dtype=float)
+        self.gamma_values = np.asarray(gamma_values, dtype=float)
+        self.delta_values = np.asarray(delta_values, dtype=float)
         self.time_steps = time_steps
         self.num_patches = num_patches
         self.start_noise_at = start_noise_at
         self.noise_mean = noise_mean
         self.noise_std = noise_std
+        self.rng = np.random.default_rng(seed)
+        self._prod_cache = {} # product spaces already built, keyed by (values, num_patches)
 
-    def parameter_product_space(self, values):
+    def parameter_product_space(self, values, cache=True):
         """
         Purpose:
         Generate all combinations of parameter values across patches.
         
         Inputs:
         - values: List of parameter values
+        - cache: Boolean flag indicating whether to reuse/store the result for these values (default: True)
         
         Outputs:
-        Numpy array representing the parameter space across patches.
+        Float32 numpy array representing the parameter space across patches. Cached results are read-only.
         """
-        combinations = list(product(values, repeat=self.num_patches))
-        tensor_shape = (len(combinations), self.num_patches)
-        tensor = np.empty(tensor_shape)
+        values = np.asarray(values, dtype=float).ravel()
+        key = (tuple(values.tolist()), self.num_patches)
+        if cache and key in self._prod_cache:
+            return self._prod_cache[key]
 
-        for i, combination in enumerate(combinations):
-            tensor[i, :] = combination
+        tensor_shape = (len(values) ** self.num_patches, self.num_patches)
+        tensor = _fill_product(values, self.num_patches, np.empty(tensor_shape, dtype=np.float32))
 
+        if cache:
+            tensor.setflags(write=False)
+            self._prod_cache[key] = tensor
         return tensor
 
     def generate_tensor(self, parameter_values):
@@ -61,22 +109,21 @@ class HyperParameters:
         - parameter_values: List of parameter values
         
         Outputs:
-        List of numpy arrays representing tensors for each time step.
+        List of float32 numpy arrays representing tensors for each time step.
         """
+        base = self.parameter_product_space(parameter_values, cache=False) # values may already carry per-step noise
+
         tensors = []
         for t in self.time_steps:
-            combinations = list(product(parameter_values, repeat=self.num_patches))
-            tensor_shape = (len(combinations), self.num_patches)
-            tensor = np.empty(tensor_shape)
-
-            for i, combination in enumerate(combinations):
-                if self.start_noise_at is not None and t >= self.start_noise_at:
-                    noisy_combination = abs(np.array(combination) + np.random.normal(self.noise_mean, self.noise_std, self.num_patches))
-                    tensor[i, :] = noisy_combination
-                else:
-                    tensor[i, :] = combination
-
-            tensors.append(tensor)
+            if self.start_noise_at is not None and t >= self.start_noise_at:
+                # Draw the noise straight into the output and fold it in place to avoid temporaries
+                tensor = self.rng.standard_normal(dtype=np.float32, out=np.empty_like(base))
+                tensor *= self.noise_std
+                tensor += self.noise_mean
+                tensor += base
+                tensors.append(np.abs(tensor, out=tensor))
+            else:
+                tensors.append(base.copy())
         return tensors
 
     def save_tensor_as_csv(self, df, filename):
@@ -91,7 +138,12 @@ class HyperParameters:
         Outputs:
         None
         """
-        df.to_csv(filename, index=False)
+        if pa is not None:
+            # PyArrow's writer formats the columns in C++ with multiple threads; unquoted to match pandas' output
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filename,
+                            write_options=pacsv.WriteOptions(quoting_style="none", quoting_header="none"))
+        else:
+            df.to_csv(filename, index=False, float_format=_format_float, lineterminator='\n')
 
     def save_tensor(self, tensor):
         """
@@ -104,14 +156,59 @@ class HyperParameters:
         Outputs:
         DataFrame with columns for patch IDs, time steps, and instance IDs.
         """
-        tensor_reshaped = tensor.reshape(-1, self.num_patches)
+        # Column-major so each patch column is contiguous for the column-wise access downstream
+        tensor_reshaped = np.asfortranarray(tensor.reshape(-1, self.num_patches), dtype=np.float32)
         df = pd.DataFrame(tensor_reshaped, columns=[f'Patch_{j+1}' for j in range(self.num_patches)])
         rows_per_step = tensor_reshaped.shape[0] // len(self.time_steps)
-        df['Time_Step'] = np.repeat(self.time_steps, len(tensor_reshaped) // len(self.time_steps))
-        df['id'] = np.tile(np.arange(0, rows_per_step), len(self.time_steps))
+        df['Time_Step'] = pd.Categorical(np.repeat(np.asarray(self.time_steps, dtype=np.int32), rows_per_step)) # categorical for fast per-step lookups
+        df['id'] = np.broadcast_to(np.arange(rows_per_step, dtype=np.int32), (len(self.time_steps), rows_per_step)).ravel()
 
         return df
 
+    def _time_step_tensor(self, values, global_param_change=False):
+        """
+        Purpose:
+        Generate the stacked tensor of one parameter for every time step, adding noise from start_noise_at onwards.
+        
+        Inputs:
+        - values: Numpy array of parameter values
+        - global_param_change: Boolean flag indicating whether to use global parameter change
+        
+        Outputs:
+        Numpy array with the tensor of every time step stacked along the rows.
+        """
+        time_steps = np.asarray(self.time_steps)
+        num_time_steps = len(time_steps)
+
+        if self.start_noise_at is not None:
+            noisy_steps = time_steps >= self.start_noise_at
+        else:
+            noisy_steps = np.zeros(num_time_steps, dtype=bool)
+
+        # Draw the noise of every noisy step in a single call; noise grows with the number of steps since it started
+        scale = (time_steps[noisy_steps] - (self.start_noise_at or 0) + 1)[:, None]
+        noise = self.rng.normal(self.noise_mean, self.noise_std, (int(noisy_steps.sum()), len(values)))
+        noisy_values = np.abs(values + noise * scale)
+
+        if global_param_change:
+            rows = num_time_steps * len(values) ** self.num_patches
+            tensors = np.empty((num_time_steps * rows, self.num_patches), dtype=np.float32)
+            noisy_iter = iter(noisy_values)
+            for t_idx in range(num_time_steps):
+                step_values = next(noisy_iter) if noisy_steps[t_idx] else values
+                np.concatenate(self.generate_tensor(step_values), out=tensors[t_idx * rows:(t_idx + 1) * rows])
+            return tensors
+
+        rows = len(values) ** self.num_patches
+        tensors = np.empty((num_time_steps, rows, self.num_patches), dtype=np.float32)
+        # Noise-free steps share the cached product space
+        tensors[~noisy_steps] = self.parameter_product_space(values)
+        if noisy_steps.any():
+            # Gather the product spaces of all noisy steps at once from the value indices of each combination
+            combination_index = _fill_product(np.arange(len(values)), self.num_patches, np.empty((rows, self.num_patches), dtype=np.intp))
+            tensors[noisy_steps] = noisy_values[:, combination_index]
+        return tensors.reshape(-1, self.num_patches)
+
     def generate_and_save_tensors(self, global_param_change=False, save_csv=True):
         """
         Purpose:
@@ -124,67 +221,80 @@ class HyperParameters:
         Outputs:
         DataFrames containing beta, gamma, and delta tensors.
         """
-        beta_tensors = []
-        gamma_tensors = []
-        delta_tensors = []
-
-        for t in self.time_steps:
-            if self.start_noise_at is not None and t >= self.start_noise_at:
-                noisy_beta_values = [abs(beta + np.random.normal(self.noise_mean, self.noise_std) * (t - self.start_noise_at + 1)) for beta in self.beta_values]
-                noisy_gamma_values = [abs(gamma + np.random.normal(self.noise_mean, self.noise_std) * (t - self.start_noise_at + 1)) for gamma in self.gamma_values]
-                noisy_delta_values = [abs(delta + np.random.normal(self.noise_mean, self.noise_std) * (t - self.start_noise_at + 1)) for delta in self.delta_values]
-            else:
-                noisy_beta_values = self.beta_values
-                noisy_gamma_values = self.gamma_values
-                noisy_delta_values = self.delta_values
-
-            if global_param_change:
-                beta_tensor = self.generate_tensor(noisy_beta_values)
-                gamma_tensor = self.generate_tensor(noisy_gamma_values)
-                delta_tensor = self.generate_tensor(noisy_delta_values)
-            else:
-                beta_tensor = self.parameter_product_space(noisy_beta_values)
-                gamma_tensor = self.parameter_product_space(noisy_gamma_values)
-                delta_tensor = self.parameter_product_space(noisy_delta_values)
-
-            beta_tensors.append(beta_tensor)
-            gamma_tensors.append(gamma_tensor)
-            delta_tensors.append(delta_tensor)
+        beta_tensors = self._time_step_tensor(self.beta_values, global_param_change)
+        gamma_tensors = self._time_step_tensor(self.gamma_values, global_param_change)
+        delta_tensors = self._time_step_tensor(self.delta_values, global_param_change)
             
-        beta_tensors_df = self.save_tensor(np.concatenate(beta_tensors))
-        gamma_tensors_df = self.save_tensor(np.concatenate(gamma_tensors))
-        delta_tensors_df = self.save_tensor(np.concatenate(delta_tensors))
+        beta_tensors_df = self.save_tensor(beta_tensors)
+        gamma_tensors_df = self.save_tensor(gamma_tensors)
+        delta_tensors_df = self.save_tensor(delta_tensors)
 
         if save_csv:
-            self.save_tensor_as_csv(beta_tensors_df, 'beta_tensors.csv')
-            self.save_tensor_as_csv(gamma_tensors_df, 'gamma_tensors.csv')
-            self.save_tensor_as_csv(delta_tensors_df, 'delta_tensors.csv')
+            # Write the three files concurrently; both CSV writers release the GIL while writing
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [executor.submit(self.save_tensor_as_csv, beta_tensors_df, 'beta_tensors.csv'),
+                           executor.submit(self.save_tensor_as_csv, gamma_tensors_df, 'gamma_tensors.csv'),
+                           executor.submit(self.save_tensor_as_csv, delta_tensors_df, 'delta_tensors.csv')]
+                for future in futures:
+                    future.result()
 
         return beta_tensors_df, gamma_tensors_df, delta_tensors_df
     
     def generate_dataframe(self):
-        beta_gamma_delta_list = []
-
-        for time_step in range(1, self.time_steps+1):  
-            concatenated_df = pd.merge(self.beta_tensors[self.beta_tensors['Time_Step'] == time_step].assign(key=0),
-                                        self.gamma_tensors[self.gamma_tensors['Time_Step'] == time_step].assign(key=0),
-                                        on='key').merge(self.delta_tensors[self.delta_tensors['Time_Step'] == time_step].assign(key=0),
-                                                      on='key').drop('key', axis=1)
-
-            concatenated_df['Configuration_id'] = range(len(concatenated_df))
-
-            beta_gamma_delta_list.append(concatenated_df)
-
-        beta_gamma_delta = pd.concat(beta_gamma_delta_list, ignore_index=True)
-
+        """
+        Purpose:
+        Combine the beta, gamma, and delta tensors into every configuration for each time step.
+        
+        Inputs:
+        None
+        
+        Outputs:
+        DataFrame with one row per (beta, gamma, delta) configuration and time step.
+        """
         patches = [col for col in self.beta_tensors.columns if col.startswith('Patch_')]
-
-        for patch in patches:
-            beta_gamma_delta[f'Beta_{patch}'] = beta_gamma_delta[f'{patch}_x']
-            beta_gamma_delta[f'Gamma_{patch}'] = beta_gamma_delta[f'{patch}_y']
-            beta_gamma_delta[f'Delta_{patch}'] = beta_gamma_delta[patch]
-
-        beta_gamma_delta = beta_gamma_delta.drop([f'{patch}_x' for patch in patches] + [f'{patch}_y' for patch in patches] + patches, axis=1)
+        time_step_blocks, config_blocks = [], []
+        beta_blocks, gamma_blocks, delta_blocks = [], [], []
+        beta_id_blocks, gamma_id_blocks, delta_id_blocks = [], [], []
+
+        # Row positions of each time step, computed once instead of scanning Time_Step every iteration
+        beta_index = self.beta_tensors.groupby('Time_Step', sort=False, observed=True).indices
+        gamma_index = self.gamma_tensors.groupby('Time_Step', sort=False, observed=True).indices
+        delta_index = self.delta_tensors.groupby('Time_Step', sort=False, observed=True).indices
+        no_rows = np.empty(0, dtype=np.intp)
+
+        for time_step in range(1, self.time_steps+1):
+            beta_step = self.beta_tensors.iloc[beta_index.get(time_step, no_rows)]
+            gamma_step = self.gamma_tensors.iloc[gamma_index.get(time_step, no_rows)]
+            delta_step = self.delta_tensors.iloc[delta_index.get(time_step, no_rows)]
+            nb, ng, nd = len(beta_step), len(gamma_step), len(delta_step)
+
+            # Cross product of the three tensors: beta varies slowest, delta fastest
+            beta_blocks.append(np.repeat(beta_step[patches].to_numpy(), ng * nd, axis=0))
+            gamma_blocks.append(np.tile(np.repeat(gamma_step[patches].to_numpy(), nd, axis=0), (nb, 1)))
+            delta_blocks.append(np.tile(delta_step[patches].to_numpy(), (nb * ng, 1)))
+            beta_id_blocks.append(np.repeat(beta_step['id'].to_numpy(), ng * nd))
+            gamma_id_blocks.append(np.tile(np.repeat(gamma_step['id'].to_numpy(), nd), nb))
+            delta_id_blocks.append(np.tile(delta_step['id'].to_numpy(), nb * ng))
+            time_step_blocks.append(np.full(nb * ng * nd, time_step))
+            config_blocks.append(np.arange(nb * ng * nd))
+
+        beta_block = np.concatenate(beta_blocks)
+        gamma_block = np.concatenate(gamma_blocks)
+        delta_block = np.concatenate(delta_blocks)
+
+        columns = {
+            'Time_Step': np.concatenate(time_step_blocks),
+            'Beta_id': np.concatenate(beta_id_blocks),
+            'Gamma_id': np.concatenate(gamma_id_blocks),
+            'Delta_id': np.concatenate(delta_id_blocks),
+            'Configuration_id': np.concatenate(config_blocks),
+        }
+        for j, patch in enumerate(patches):
+            columns[f'Beta_{patch}'] = beta_block[:, j]
+            columns[f'Gamma_{patch}'] = gamma_block[:, j]
+            columns[f'Delta_{patch}'] = delta_block[:, j]
+
+        beta_gamma_delta = pd.DataFrame(columns)
 
         return beta_gamma_delta
 
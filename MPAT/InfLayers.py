@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from Polygon import Polygon
 from Adjacency import Adjacency
@@ -12,13 +13,23 @@ class InfLayers:
         Initializes the InfLayers class with provided inputs.
 
         Parameters:
-        - information_layers_dataframe (str): Path to the CSV file containing information layers.
+        - information_layers_dataframe (str or pd.DataFrame): Path to the CSV file containing information layers, or the already loaded DataFrame.
         - polygon_input (str, optional): Path to the shapefile for polygon input.
         - adjacency_input (str, optional): Not used, included for future extension.
         - adjacency_file (str, optional): Path to the adjacency matrix file.
         """
-        # Load the information layers dataframe from the provided CSV file
-        self.information_layers_dataframe = pd.read_csv(information_layers_dataframe)
+        # Use the information layers dataframe directly if given, otherwise load it from the provided CSV file
+        if isinstance(information_layers_dataframe, pd.DataFrame):
+            self.information_layers_dataframe = information_layers_dataframe
+        else:
+            try:
+                self.information_layers_dataframe = pd.read_csv(information_layers_dataframe, engine='pyarrow', dtype_backend='pyarrow')
+            except ImportError:
+                # Fall back to the C parser if pyarrow is not installed
+                self.information_layers_dataframe = pd.read_csv(information_layers_dataframe)
+
+        # The layers are not modified after loading, so keep their values as one contiguous array
+        self._layers_values = np.ascontiguousarray(self.information_layers_dataframe.iloc[:, 1:].to_numpy(dtype=np.float32))
         
         # Initialize input parameters
         self.polygon_input = polygon_input
@@ -51,6 +62,20 @@ class InfLayers:
             self.adj_matrix = None
             self.adj_grid = None
 
+    def _multiply_layers(self, frame):
+        """
+        Multiplies the grid cell mix of each row with the information layers on the raw NumPy arrays.
+
+        Parameters:
+        - frame (pd.DataFrame): Grid or adjacency data with a 'grid_cell_mix' column.
+
+        Returns:
+        - pd.DataFrame: Copy of the frame with the per-row products in a 'grid_cell' column.
+        """
+        mix = frame['grid_cell_mix'].to_numpy(copy=False)
+        grid_cell = np.multiply(mix[:, None], self._layers_values)
+        return frame.assign(grid_cell=list(grid_cell))
+
     def process_layers(self):
         """
         Processes the information layers by performing element-wise multiplication with the grid or adjacency data.
@@ -61,13 +86,13 @@ class InfLayers:
         # If grid data is available, process it
         if self.grid is not None:
             # Perform element-wise multiplication with information layers
-            self.grid['grid_cell'] = self.grid['grid_cell_mix'] * self.information_layers_dataframe.iloc[:, 1:].values
+            self.grid = self._multiply_layers(self.grid)
             return self.grid
 
         # If adjacency grid data is available, process it
         elif self.adj_grid is not None:
             # Perform element-wise multiplication with information layers
-            self.adj_grid['grid_cell'] = self.adj_grid['grid_cell_mix'] * self.information_layers_dataframe.iloc[:, 1:].values
+            self.adj_grid = self._multiply_layers(self.adj_grid)
             return self.adj_grid
 
         # If neither grid nor adjacency grid data is available, print an error message
@@ -1,7 +1,199 @@
+import os
+import functools
+import json
 import geopandas as gpd
 import pandas as pd
 import numpy as np
+import scipy.sparse
+import shapely
 import shapely.geometry
+from GenericGridAdjacencyMatrix import GenericGridAdjacencyMatrix
+
+# pyogrio (with pyarrow) reads shapefiles considerably faster than fiona
+try:
+    import pyogrio
+    import pyogrio.errors
+except ImportError:
+    pyogrio = None
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# dask-geopandas is only needed to parallelize the spatial join on large grids (use_dask=True)
+try:
+    import dask_geopandas
+except ImportError:
+    dask_geopandas = None
+
+
+def read_shapefile(shapefile_path, where=None, columns=None, exclude_columns=None):
+    """
+    Read a shapefile, preferring a GeoParquet copy saved next to it (same name, .parquet extension).
+
+    Parameters:
+    - shapefile_path (str): Path to the shapefile.
+    - where (str, optional): SQL WHERE clause pushed down to the reader when pyogrio is used, so that
+      filtered-out rows are never decoded. Other readers load every row. Defaults to None.
+    - columns (list, optional): Attribute columns to read (geometry is always read), or None for all. Defaults to None.
+    - exclude_columns (list, optional): Attribute columns to leave out of the ones read. Defaults to None.
+
+    Returns:
+    - gdf (GeoDataFrame): GeoDataFrame containing polygon geometries.
+    """
+    parquet_path = os.path.splitext(shapefile_path)[0] + '.parquet'
+    if pyarrow is not None and os.path.exists(parquet_path):
+        if exclude_columns is not None:
+            # The field list comes from the schema of the file that is actually read
+            fields = columns if columns is not None else [name for name in pyarrow.parquet.read_schema(parquet_path).names if name != 'geometry']
+            columns = [field for field in fields if field not in exclude_columns]
+        return gpd.read_parquet(parquet_path, columns=None if columns is None else list(columns) + ['geometry'])
+    if pyogrio is not None:
+        # Columns that are not requested are skipped by the reader instead of being decoded and dropped
+        try:
+            if exclude_columns is not None:
+                fields = columns if columns is not None else pyogrio.read_info(shapefile_path)['fields']
+                columns = [field for field in fields if field not in exclude_columns]
+            return gpd.read_file(shapefile_path, engine='pyogrio', use_arrow=pyarrow is not None, where=where, columns=columns)
+        except pyogrio.errors.DataSourceError as e:
+            # pyogrio reports a missing file as a generic data source error; GDAL paths and URLs are left to the reader
+            if "No such file" in str(e):
+                raise FileNotFoundError(2, "No such file", shapefile_path) from e
+            raise
+    gdf = gpd.read_file(shapefile_path)
+    if columns is not None:
+        gdf = gdf[list(columns) + ['geometry']]
+    return gdf if exclude_columns is None else gdf.drop(columns=list(exclude_columns), errors='ignore')
+
+def _read_json(json_path):
+    # Cached by absolute path, so the same relative name in another working directory is read again
+    return _read_json_cached(os.path.abspath(json_path))
+
+@functools.lru_cache(maxsize=None)
+def _read_json_cached(json_path):
+    # Lookup tables (State_Names.json, ISO_CC.json) only need to be read once per process.
+    # They are small, so plain dicts ({column: {row: value}}) are used instead of building a DataFrame
+    with open(json_path) as f:
+        return json.load(f)
+
+@functools.lru_cache(maxsize=32)
+def _load_gdf(shapefile_path, US, state_tuple, iso_tuple, working_dir):
+    """
+    Read and filter the polygons for a Polygon instance. Results are cached, so callers should copy before modifying.
+    
+    Parameters:
+    - shapefile_path (str): Path to the user shapefile, or None/empty to use the bundled shapefiles.
+    - US (bool): Flag indicating whether to use the U.S. county shapefile.
+    - state_tuple (tuple): State abbreviations to filter if US is True, or None.
+    - iso_tuple (tuple): Country ISO 3166-1 alpha-3 codes to filter, or None.
+    - working_dir (str): Current working directory, which relative paths (including the bundled shapefiles) are read from.
+      Only used as part of the cache key.
+    
+    Returns:
+    - gdf (GeoDataFrame): GeoDataFrame containing polygon geometries.
+    """
+    if shapefile_path:
+        # Load shapefile
+        gdf = read_shapefile(shapefile_path)
+        gdf = gdf.to_crs(epsg=4326)
+        return gdf
+    
+    # If Non-U.S., use World shapefile and filter by country or countries of interest
+    if iso_tuple is not None:
+        # filter for the shapefiles of every country in the world shapefile 
+        # Pushes the country filter down to the reader; the filters below still apply when it is not supported
+        where = "ISO_CC IN (%s) AND COUNTRY <> 'Clipperton'" % ", ".join("'%s'" % str(iso).replace("'", "''") for iso in iso_tuple) if iso_tuple else None
+        gdf = read_shapefile("World_Countries.shp", where=where) # reads shapefile of countries
+        gdf.to_crs(epsg=4326, inplace=True) # converts the CRS to EPSG:4326 for consitency
+    
+        # Preprocessing for cleaning
+        gdf = gdf[gdf['COUNTRY'] != 'Clipperton'] # This is an uninhabitated French island: https://www.cia.gov/the-world-factbook/countries/clipperton-island/: so we remove it
+        gdf = gdf[gdf['COUNTRY'] != 'United States'] # We have specific shapefile that includes U.S. states, so this is handled differently
+    
+        # Mapping Country ISO ids.
+        # NOTE: This code uses the Alpha-3 code e.g. AFG, ALB, DZA, etc. We refer to the following for a complete list: https://www.iso.org/obp/ui/#search
+        # NOTE: ISO_CC.json contains these Alpha-3 codes
+        Country_ISO = set(_read_json('ISO_CC.json')['ISO_CC'].values()) # imports the ISO of each country
+        ISO_values = [iso for iso in iso_tuple if iso in Country_ISO] # maps the input ISO values to those in the shapefile for constency
+        gdf = gdf[gdf['ISO_CC'].isin(ISO_values)]  # returns geopandas dataframe of selected countries
+        gdf = gdf.reset_index(drop=True) 
+        return gdf
+    
+    # If U.S.
+    if US:
+        where = None
+        if state_tuple is not None:
+            STATE_NAMES = _read_json('State_Names.json')  # imports the State_name, Abbreviation, and STATEFP (as id)
+            STATE_FP = {STATE_NAMES['Abrev'][row]: int(STATE_NAMES['STATEFP'][row]) for row in STATE_NAMES['Abrev']}  # Convert to int for pointer
+            statefp_values = [STATE_FP[abrev] for abrev in state_tuple if abrev in STATE_FP]  # maps the input abbreviations to the corresponding STATEFP
+            # Pushes the state filter down to the reader; STATEFP is stored as a zero-padded string
+            if len(statefp_values):
+                where = "STATEFP IN (%s)" % ", ".join("'%02d'" % fp for fp in statefp_values)
+        # The state selection drops these columns below, so they are not read at all
+        exclude_columns = ['LSAD', 'ALAND', 'AWATER'] if state_tuple is not None else None
+        gdf = read_shapefile("cb_2023_us_county_500k.shp", where=where, exclude_columns=exclude_columns) # reads shapefile of U.S.
+        gdf.to_crs(epsg=4326, inplace=True) # converts the CRS to EPSG:4326 for consitency
+        # filter for contiguous US states excluding Alaska (02) and Hawaii (15)
+        statefp = pd.to_numeric(gdf['STATEFP']) # parse the codes once for both the filter and the int column
+        contiguous = (statefp < 60) & (statefp != 2) & (statefp != 15)
+        gdf = gdf[contiguous]
+        gdf['STATEFP'] = statefp[contiguous].astype(int) # convert STATEFP to int for indexing
+        
+        # If U.S. and U.S. State
+        if state_tuple is not None:
+            # If US shapefile and user wants to select certain state
+            gdf = gdf[gdf['STATEFP'].isin(statefp_values)]  # returns geopandas dataframe of statefps
+            gdf = gdf.reset_index(drop=True)
+        
+        return gdf # if no state selected, then return US geopandas dataframe
+    
+    # Handle case where shapefile_path is empty and countryiso and US is None
+    return None
+
+def shapefile_to_parquet(shapefile_path):
+    """
+    Save a GeoParquet copy of a shapefile so that read_shapefile can load it faster. Requires pyarrow.
+
+    Parameters:
+    - shapefile_path (str): Path to the shapefile.
+
+    Returns:
+    - parquet_path (str): Path to the saved GeoParquet file.
+    """
+    parquet_path = os.path.splitext(shapefile_path)[0] + '.parquet'
+    read_shapefile(shapefile_path).to_parquet(parquet_path)
+    return parquet_path
+
+def to_dense_df(adj_matrix):
+    """
+    Convert a sparse adjacency matrix to the dense DataFrame form with patch IDs starting at 1.
+
+    Parameters:
+    - adj_matrix (scipy.sparse matrix): Sparse adjacency matrix.
+
+    Returns:
+    - adj_df (DataFrame): DataFrame representing adjacency matrix.
+    """
+    n = adj_matrix.shape[0]
+    return pd.DataFrame(adj_matrix.toarray(), index=range(1, n+1), columns=range(1, n+1))
+
+def _grid_cell_mix_frame(grid_ids, county_ids, proportions):
+    """
+    Long-form grid cell mix, one row per (grid cell, GEOID) pair.
+
+    Parameters:
+    - grid_ids (ndarray): Grid cell ID of each pair.
+    - county_ids (ndarray): GEOID of each pair.
+    - proportions (ndarray): Proportion of the grid cell in the GEOID.
+
+    Returns:
+    - grid_cell_mix_df (DataFrame): Columns 'ID', 'GEOID' and 'proportion'.
+    """
+    # Arrow-backed strings store the repeated GEOIDs without one Python object per row
+    return pd.DataFrame({'ID': grid_ids,
+                         'GEOID': pd.array(county_ids, dtype='string[pyarrow]' if pyarrow is not None else object),
+                         'proportion': proportions})
 
 class Polygon:
     """
@@ -18,12 +210,13 @@ class Polygon:
     - hex_grid (bool, optional): Flag indicating whether to use the square grid(False) or hexagonal grid (True). Default is False.
     - overlap (bool, optional): Flag indicating whether grid cells can overlap polygon boundaries. Defaults to True.
     - crs (str, optional): Coordinate reference system (CRS) of the shapefile. Defaults to "EPSG:4326".
+    - use_dask (bool, optional): Flag indicating whether to run the overlap spatial join in parallel partitions with dask-geopandas. Defaults to False.
     
     Returns: 
     - Geopandas dataframe of grid cells
     - Correspondingadjacency matrix
     """
-    def __init__(self, shapefile_path, grid_size, US = False, stateabrev = None, countryiso = None, overlap = True, crs="EPSG:4326"):
+    def __init__(self, shapefile_path, grid_size, US = False, stateabrev = None, countryiso = None, overlap = True, crs="EPSG:4326", use_dask = False):
         # Cannot use both U.S. and country's shapefiles
         if countryiso is not None and US:
             raise ValueError("US cannot be True when countryiso is not None.")
@@ -37,6 +230,8 @@ class Polygon:
         self.countryiso = countryiso
         self.overlap = overlap
         self.crs = crs
+        self.use_dask = use_dask
+        self.grid_cell_mix_df = None # long-form grid cell mix of the last U.S. grid created
         self.gdf = self.polygoninitialization()
 
     def polygoninitialization(self):
@@ -46,120 +241,140 @@ class Polygon:
         Returns:
         - gdf (GeoDataFrame): GeoDataFrame containing polygon geometries.
         """
-        if self.shapefile_path:
-            try:
-                # Load shapefile
-                gdf = gpd.read_file(self.shapefile_path)
-                gdf = gdf.to_crs(epsg=4326)
-                return gdf
-            
-            except FileNotFoundError as e:
-                print(f"File not found: {e.filename}")
-                return None
-            
-        if not self.shapefile_path:
-            # If Non-U.S., use World shapefile and filter by country or countries of interest
-            if self.countryiso is not None:
-                try:
-                    # filter for the shapefiles of every country in the world shapefile 
-                    gdf = gpd.read_file("World_Countries.shp") # reads shapefile of countries
-                    gdf.to_crs(epsg=4326, inplace=True) # converts the CRS to EPSG:4326 for consitency
-                
-                    # Preprocessing for cleaning
-                    gdf = gdf[gdf['COUNTRY'] != 'Clipperton'] # This is an uninhabitated French island: https://www.cia.gov/the-world-factbook/countries/clipperton-island/: so we remove it
-                    gdf = gdf[gdf['COUNTRY'] != 'United States'] # We have specific shapefile that includes U.S. states, so this is handled differently
-                
-                    # Mapping Country ISO ids.
-                    # NOTE: This code uses the Alpha-3 code e.g. AFG, ALB, DZA, etc. We refer to the following for a complete list: https://www.iso.org/obp/ui/#search
-                    # NOTE: ISO_CC.json contains these Alpha-3 codes
-                    Country_ISO = pd.read_json('ISO_CC.json') # imports the ISO of each country (along with country name and continent)
-                    ISO_values = Country_ISO[Country_ISO['ISO_CC'].isin(self.countryiso)] # maps the input ISO values to those in the shapefile for constency
-                    gdf = gdf[gdf['ISO_CC'].isin(ISO_values['ISO_CC'])]  # returns geopandas dataframe of selected countries
-                    gdf = gdf.reset_index(drop=True) 
-                
-                    return gdf
-            
-                except FileNotFoundError as e:
-                    print(f"File not found: {e.filename}")
-                    return gdf
-                
-            # If U.S.
-            if self.US:
-                try:
-                    gdf = gpd.read_file("cb_2023_us_county_500k.shp") # reads shapefile of U.S.
-                    gdf.to_crs(epsg=4326, inplace=True) # converts the CRS to EPSG:4326 for consitency
-                    # filter for contiguous US states excluding Alaska (02) and Hawaii (15)
-                    gdf = gdf[(pd.to_numeric(gdf['STATEFP']) < 60) & (pd.to_numeric(gdf['STATEFP']) != 2) & (pd.to_numeric(gdf['STATEFP']) != 15)]
-                    gdf['STATEFP'] = gdf['STATEFP'].astype(int) # convert STATEFP to int for indexing
-                 
-                except FileNotFoundError:
-                    print("US Shapefile not found.")
-                
-                # If U.S. and U.S. State
-                if self.stateabrev is not None:
-                    # If US shapefile and user wants to select certain state
-                    try:
-                        STATE_NAMES = pd.read_json('State_Names.json')  # imports the State_name, Abbreviation, and STATEFP (as id)
-                        STATE_NAMES['STATEFP'] = STATE_NAMES['STATEFP'].astype(int)  # Convert to int for pointer
-                        statefp_values = STATE_NAMES[STATE_NAMES['Abrev'].isin(self.stateabrev)]['STATEFP'].values  # maps the input abbreviations to the corresponding STATEFP
-                        gdf = gdf[gdf['STATEFP'].isin(statefp_values)]  # returns geopandas dataframe of statefps
-                        gdf = gdf.drop(columns=['LSAD', 'ALAND', 'AWATER'])
-                        gdf = gdf.reset_index(drop=True)
-                        return gdf
-                    
-                    except FileNotFoundError:
-                        print("State_Names.json file missing or not found.")
-                        return gdf
-            
-                else:
-                    return gdf # if no state selected, then return US geopandas dataframe
-                
-            else:
-                return gdf # if not US shapefile, then return US geopandas dataframe
-            
-        # Handle case where shapefile_path is empty and countryiso and US is None
-        return None
+        # Filters are passed as sorted tuples so that equivalent requests share one cache entry
+        state_tuple = tuple(sorted(set(self.stateabrev))) if self.stateabrev is not None else None
+        iso_tuple = tuple(sorted(set(self.countryiso))) if self.countryiso is not None else None
+        try:
+            # The working directory is part of the key, since the paths may be relative (GDAL sources are not made absolute)
+            gdf = _load_gdf(self.shapefile_path, self.US, state_tuple, iso_tuple, os.getcwd())
+        except FileNotFoundError as e:
+            print(f"File not found: {e.filename}")
+            return None
         
+        # Copy so that changes made by one instance do not leak into the cached GeoDataFrame
+        return gdf.copy() if gdf is not None else None
         
+        
+    def _overlap_sjoin(self, grid):
+        """
+        Keep the grid cells that intersect the polygons, one row per grid cell.
+
+        Parameters:
+        - grid (GeoDataFrame): Grid cells to join with the polygons.
+
+        Returns:
+        - grid (GeoDataFrame): Grid cells joined with the first intersecting polygon.
+        - pairs (tuple): Positions (grid cell in grid, polygon in self.gdf) of every intersecting pair, or None if not available.
+        """
+        if self.use_dask:
+            if dask_geopandas is None:
+                raise ImportError("use_dask=True requires the dask-geopandas package.")
+            # Partitions are contiguous row ranges, so concatenating the results keeps the row order of a single sjoin
+            dgrid = dask_geopandas.from_geopandas(grid, npartitions=os.cpu_count() or 1)
+            joined = dgrid.sjoin(self.gdf, how='inner').compute()
+        else:
+            joined = grid.sjoin(self.gdf, how='inner')
+        # A cell intersecting several polygons keeps its grid index in every joined row, so deduplicate on the integer index rather than hashing geometries
+        grid = joined[~joined.index.duplicated(keep='first')]
+
+        # The joined rows already list every intersecting (grid cell, polygon) pair, so the grid cell mix can reuse them
+        pairs = None
+        if 'index_right' in joined:
+            pairs = (grid.index.get_indexer(joined.index), self.gdf.index.get_indexer(joined['index_right']))
+        return grid, pairs
+
     def get_grid_cell_mix(self, grid):
         """
         Calculate distribution of grid cell coverage over polygons.
         
         Parameters:
-        - grid (GeoDataFrame): Grid cell geometry to calculate distribution over polygons.
+        - grid (shapely geometry): Grid cell geometry to calculate distribution over polygons. A grid row (Series) with a 'geometry' entry is also accepted.
 
         Returns:
         - grid_cell_mix (dict): Dictionary with grid cell distribution for each GEOID.
         """
-        intersecting_grid_cells = self.gdf[self.gdf.intersects(grid['geometry'])]
+        # Works on the raw geometry, so callers do not need to build a Series per grid cell
+        geometry = grid['geometry'] if isinstance(grid, pd.Series) else grid
+        # The spatial index (built once per GeoDataFrame) only tests counties whose bounding boxes meet the cell; sorted to keep the county order
+        county_idx = np.sort(self.gdf.sindex.query(geometry, predicate='intersects'))
 
-        if len(intersecting_grid_cells) == 0:
+        if len(county_idx) == 0:
             return None
         
+        # Intersection area of the cell with every intersecting county, computed in one vectorized call
+        county_geoms = np.asarray(self.gdf.geometry.values[county_idx])
+        areas = shapely.area(shapely.intersection(geometry, county_geoms))
+        county_ids = self.gdf['GEOID'].to_numpy()[county_idx]
         
         # Calculate the total area covered by each cell interesecting the county
-        total_area = sum(grid['geometry'].intersection(county['geometry']).area 
-                     for _, county in intersecting_grid_cells.iterrows())
+        total_area = areas.sum()
         
         # Saves the GEOID and corresponding proportion as a dictionary
-        grid_cell_mix = {}
-
         if total_area == 0:
-            for county_id in intersecting_grid_cells['GEOID']:
-                #print("Total area of intersection is zero.")
-                grid_cell_mix[county_id] = 0 # Sets column to zero for all GEOIDs.        
-        
+            grid_cell_mix = dict.fromkeys(county_ids, 0) # Sets column to zero for all GEOIDs.
         else:
             # If total area is nonzero, calculate the proportion that cell of the GEOIDs i.e. intersecting polygons
-            for _, county in intersecting_grid_cells.iterrows():
-                intersection_area = grid['geometry'].intersection(county['geometry']).area # calculates the intersection area of the cell geometry with the county geometry
-                proportion = intersection_area / total_area # calculates the proportion of the cell intersection area of the cell geometry with the county geometry
-                grid_cell_mix[county['GEOID']] = proportion # stores the proportion
+            grid_cell_mix = dict(zip(county_ids, (areas / total_area).tolist()))
             
         return grid_cell_mix
     
         
         
+    def _grid_cell_mix_pairs(self, grid, pairs=None):
+        """
+        Proportion of every intersecting (grid cell, polygon) pair, ordered by cell then polygon.
+        
+        Parameters:
+        - grid (GeoDataFrame): Grid cells to calculate distribution over polygons.
+        - pairs (tuple, optional): Positions (grid cell, polygon) of every intersecting pair, e.g. from _overlap_sjoin. Queried if None. Defaults to None.
+
+        Returns:
+        - cell_idx (ndarray): Position of the grid cell of each pair in grid.
+        - county_ids (ndarray): GEOID of the polygon of each pair.
+        - proportions (ndarray): Share of the covered cell area that falls in the polygon.
+        """
+        grid_geoms = np.asarray(grid.geometry.values)
+        county_geoms = np.asarray(self.gdf.geometry.values)
+        
+        # All intersecting (grid cell, county) pairs from one spatial index query, ordered by cell then county
+        if pairs is None:
+            pairs = shapely.STRtree(county_geoms).query(grid_geoms, predicate='intersects')
+        cell_idx, county_idx = pairs
+        order = np.lexsort((county_idx, cell_idx))
+        cell_idx, county_idx = cell_idx[order], county_idx[order]
+        
+        # Intersection areas of every pair and the total area covered in each cell
+        areas = shapely.area(shapely.intersection(grid_geoms[cell_idx], county_geoms[county_idx]))
+        total_area = np.bincount(cell_idx, weights=areas, minlength=len(grid))[cell_idx]
+        proportions = np.divide(areas, total_area, out=np.zeros_like(areas), where=total_area != 0) # zero for all GEOIDs of a cell with no intersection area
+        county_ids = self.gdf['GEOID'].to_numpy()[county_idx]
+        return cell_idx, county_ids, proportions
+    
+    def _compute_all_grid_cell_mix(self, grid, pairs=None):
+        """
+        Calculate distribution of grid cell coverage over polygons for every grid cell in one batch.
+        The same distribution in long form is kept in self.grid_cell_mix_df.
+        
+        Parameters:
+        - grid (GeoDataFrame): Grid cells to calculate distribution over polygons.
+        - pairs (tuple, optional): Positions (grid cell, polygon) of every intersecting pair, e.g. from _overlap_sjoin. Queried if None. Defaults to None.
+
+        Returns:
+        - grid_cell_mix (list): Dictionary with grid cell distribution for each GEOID per grid cell (None if no polygon intersects the cell).
+        """
+        cell_idx, county_ids, proportions = self._grid_cell_mix_pairs(grid, pairs)
+        self.grid_cell_mix_df = _grid_cell_mix_frame(grid['ID'].to_numpy()[cell_idx], county_ids, proportions)
+        
+        # Group the pairs of each cell into its GEOID to proportion dictionary
+        grid_cell_mix = [None] * len(grid)
+        if len(cell_idx) == 0:
+            return grid_cell_mix
+        starts = np.flatnonzero(np.r_[True, np.diff(cell_idx) != 0])
+        for cell, ids, props in zip(cell_idx[starts], np.split(county_ids, starts[1:]), np.split(proportions, starts[1:])):
+            grid_cell_mix[cell] = dict(zip(ids, props.tolist()))
+        return grid_cell_mix
+    
+    
     def create_hex_grid(self):
         """
         Create hexagonal grid over geometry.
@@ -176,37 +391,36 @@ class Polygon:
         longitude_cols = np.arange(np.floor(lon_min), np.ceil(lon_max), 3 * hexagon_size)
         latitude_rows = np.arange(np.floor(lat_min) / hexagon_height_ratio, np.ceil(lat_max) / hexagon_height_ratio, hexagon_size)
 
-        hexagons = []
-        for longitude_col in longitude_cols:
-            for row_index, hexagon_y_position in enumerate(latitude_rows):
-                if (row_index % 2 == 0):
-                    hexagon_x_start = longitude_col
-                else:
-                    hexagon_x_start = longitude_col + 1.5 * hexagon_size
-
-                hexagons.append(shapely.geometry.Polygon([
-                    (hexagon_x_start, hexagon_y_position * hexagon_height_ratio),
-                    (hexagon_x_start + hexagon_size, hexagon_y_position * hexagon_height_ratio),
-                    (hexagon_x_start + (1.5 * hexagon_size), (hexagon_y_position + hexagon_size) * hexagon_height_ratio),
-                    (hexagon_x_start + hexagon_size, (hexagon_y_position + (2 * hexagon_size)) * hexagon_height_ratio),
-                    (hexagon_x_start, (hexagon_y_position + (2 * hexagon_size)) * hexagon_height_ratio),
-                    (hexagon_x_start - (0.5 * hexagon_size), (hexagon_y_position + hexagon_size) * hexagon_height_ratio),
-                ]))
+        # Left x and bottom y of every hexagon, ordered by column, then row; odd rows are shifted right
+        hexagon_cols, row_index = np.meshgrid(longitude_cols, np.arange(len(latitude_rows)), indexing='ij')
+        hexagon_x_start = (hexagon_cols + np.where(row_index % 2 == 0, 0, 1.5 * hexagon_size)).ravel()
+        hexagon_y_position = latitude_rows[row_index].ravel()
+
+        # The six vertices of every hexagon plus the closing vertex, packed as one (7n, 2) coordinate buffer
+        x_offsets = np.array([0, hexagon_size, 1.5 * hexagon_size, hexagon_size, 0, -0.5 * hexagon_size, 0])
+        y_offsets = np.array([0, 0, hexagon_size, 2 * hexagon_size, 2 * hexagon_size, hexagon_size, 0])
+        vertices = np.stack([hexagon_x_start[:, None] + x_offsets,
+                             (hexagon_y_position[:, None] + y_offsets) * hexagon_height_ratio], axis=-1).reshape(-1, 2)
+        
+        # Build all polygons straight from the buffer (one ring of 7 vertices per polygon), without per-hexagon arrays
+        n = len(hexagon_x_start)
+        hexagons = shapely.from_ragged_array(shapely.GeometryType.POLYGON, vertices, (np.arange(0, 7 * n + 1, 7), np.arange(n + 1)))
 
         grid = gpd.GeoDataFrame({'geometry': hexagons}, crs=self.crs)
         grid["grid_area"] = grid.area
         grid = grid.reset_index().rename(columns={"index": "grid_id"})
         grid['ID'] = range(1, len(grid) + 1)
+        pairs = None
         # Overlap of areas
         if self.overlap:
             cols = ['grid_id', 'geometry', 'grid_area']
-            grid = grid.sjoin(self.gdf, how='inner').drop_duplicates('geometry')
+            grid, pairs = self._overlap_sjoin(grid)
             grid['ID'] = range(1, len(grid) + 1)
         
         if self.US:
             try:
                 # Get mixture of counties of U.S. (since given U.S. shapefile has this)
-                grid['grid_cell_mix'] = grid.apply(self.get_grid_cell_mix, axis=1)
+                grid['grid_cell_mix'] = self._compute_all_grid_cell_mix(grid, pairs)
                 grid = grid.reset_index(drop=True)
                 return grid
             
@@ -217,12 +431,14 @@ class Polygon:
             return grid
 
 
-    def create_grid(self):
+    def _grid_corners(self):
         """
-        Create square grid that covers a geodataframe area or a fixed boundary with latitude-longitude coordinates.
+        Lower-left corner coordinates of the square grid cells along each axis.
 
         Returns:
-        - grid (GeoDataFrame): GeoDataFrame of grid polygons.
+        - lon0 (ndarray): Longitudes of the cell corners.
+        - lat0 (ndarray): Latitudes of the cell corners.
+        - cell_size (float): Side length of each grid cell.
         """
         # Determine bounds
         lon_min, lat_min, lon_max, lat_max = self.gdf.total_bounds
@@ -230,26 +446,44 @@ class Polygon:
         # Calculate cell size to get approximately the desired number of grid cells
         cell_size = (lon_max - lon_min) / self.grid_size
 
+        # Lower-left corners from the bounds minimum up to and including the bounds maximum. The counts are computed
+        # explicitly, with a tolerance, so that rounding in the float step cannot drop the last column or row; the values
+        # come from the same arange as the original grid, so cells on the bounds are kept or dropped by the overlap filter alike
+        number_of_lon = int(np.floor((lon_max - lon_min) / cell_size + 1e-9)) + 1
+        number_of_lat = int(np.floor((lat_max - lat_min) / cell_size + 1e-9)) + 1
+        lon0 = np.arange(lon_min, lon_max + cell_size, cell_size)[:number_of_lon]
+        lat0 = np.arange(lat_min, lat_max + cell_size, cell_size)[:number_of_lat]
+        return lon0, lat0, cell_size
+
+
+    def create_grid(self):
+        """
+        Create square grid that covers a geodataframe area or a fixed boundary with latitude-longitude coordinates.
+
+        Returns:
+        - grid (GeoDataFrame): GeoDataFrame of grid polygons.
+        """
+        lon0, lat0, cell_size = self._grid_corners()
+        lon0, lat0 = np.meshgrid(lon0, lat0, indexing='ij') # cells ordered by longitude, then latitude
+        lon0, lat0 = lon0.ravel(), lat0.ravel()
+
         # Create grid cells
-        grid_cells = [
-            shapely.geometry.box(lon0, lat0, lon0 + cell_size, lat0 + cell_size)
-            for lon0 in np.arange(lon_min, lon_max + cell_size, cell_size)
-            for lat0 in np.arange(lat_min, lat_max + cell_size, cell_size)
-        ]
+        grid_cells = shapely.box(lon0, lat0, lon0 + cell_size, lat0 + cell_size)
 
-        grid = gpd.GeoDataFrame(grid_cells, columns=['geometry'], crs=self.crs)
+        grid = gpd.GeoDataFrame({'geometry': grid_cells}, crs=self.crs)
         grid['ID'] = range(1, len(grid) + 1)
+        pairs = None
 
         # Handle overlap
         if self.overlap:
-            grid = grid.sjoin(self.gdf, how='inner').drop_duplicates('geometry')
+            grid, pairs = self._overlap_sjoin(grid)
             grid['ID'] = range(1, len(grid) + 1)
             
             
         if self.US:
             try:
                 # Get mixture of counties of U.S. (since given U.S. shapefile has this)
-                grid['grid_cell_mix'] = grid.apply(self.get_grid_cell_mix, axis=1)
+                grid['grid_cell_mix'] = self._compute_all_grid_cell_mix(grid, pairs)
                 grid = grid.reset_index(drop=True)
                 return grid
             
@@ -260,31 +494,75 @@ class Polygon:
             return grid
     
     
-    def calculate_adjacency_matrix(self, grid):
+    def calculate_adjacency_matrix(self, grid, sparse=False):
         """
         Calculate adjacency matrix for given grid.
 
         Parameters:
         - grid (GeoDataFrame): Grid polygons for which adjacency matrix is calculated.
+        - sparse (bool, optional): Flag indicating whether to return a scipy CSR matrix instead of a DataFrame. Defaults to False.
 
         Returns:
-        - adj_df (DataFrame): DataFrame representing adjacency matrix.
+        - adj_df (DataFrame or scipy.sparse.csr_matrix): DataFrame representing adjacency matrix (int8 entries), or the CSR matrix if sparse is True.
         """
         n = len(grid)
-        adj_matrix = np.zeros((n, n), dtype=int)
         
         # Moore Neighborhood
-        for i in range(n):
-            for j in range(i + 1, n):
-                if grid.iloc[i].geometry.touches(grid.iloc[j].geometry):
-                    adj_matrix[i, j] = 1
-                    adj_matrix[j, i] = 1
+        # Query every cell against a spatial index at once, so touches is only evaluated on bounding-box neighbors
+        geoms = np.asarray(grid.geometry.values)
+        i, j = shapely.STRtree(geoms).query(geoms, predicate='touches')
+        upper = i < j
+        rows, cols = i[upper], j[upper]
+
+        # Both directions of every touching pair
+        rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        adj_matrix = scipy.sparse.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n)) # 0/1 entries fit in int8
 
-        adj_df = pd.DataFrame(adj_matrix, index=range(1, n+1), columns=range(1, n+1))
+        if sparse:
+            return adj_matrix
+        adj_df = to_dense_df(adj_matrix)
         return adj_df
     
     
-    def get_grid_and_adj_matrix(self, hexagonal = False):
+    def lattice_adjacency_matrix(self, grid, hexagonal=False):
+        """
+        Calculate adjacency matrix for a grid from create_grid or create_hex_grid using the lattice position of each cell.
+
+        Parameters:
+        - grid (GeoDataFrame): Grid polygons from create_grid (hexagonal False) or create_hex_grid (hexagonal True).
+        - hexagonal (bool, optional): Flag indicating whether the grid is hexagonal. Defaults to False.
+
+        Returns:
+        - adj_matrix (scipy.sparse.csr_matrix): Adjacency matrix (int8 entries), or None if the cells are not on the expected lattice.
+        """
+        # Neighbors follow from the integer (column, row) position of each cell, recovered from its lower-left bounds.
+        # Unlike touches, this is not sensitive to rounding in the shared cell edges.
+        bounds = shapely.bounds(np.asarray(grid.geometry.values))
+        lon_min, lat_min, lon_max, lat_max = self.gdf.total_bounds
+        if hexagonal:
+            # Same layout as create_hex_grid: rows are half a hexagon apart and odd rows are shifted right by 1.5 sides
+            hexagon_size = (lon_max - lon_min) / self.grid_size
+            hexagon_height_ratio = np.sin(np.pi / 3)
+            rows = (bounds[:, 1] - np.floor(lat_min)) / hexagon_height_ratio / hexagon_size
+            shift = np.where(np.rint(rows) % 2 == 0, 0, 1.5 * hexagon_size)
+            cols = (bounds[:, 0] + 0.5 * hexagon_size - shift - np.floor(lon_min)) / (3 * hexagon_size)
+            # Above/below, plus the two neighboring columns on each adjacent row
+            offsets = [(0, 2), (0, -2), (0, 1), (0, -1), (-1, 1), (-1, -1)]
+            odd_row_offsets = [(0, 2), (0, -2), (0, 1), (0, -1), (1, 1), (1, -1)]
+        else:
+            _, _, cell_size = self._grid_corners()
+            cols = (bounds[:, 0] - lon_min) / cell_size
+            rows = (bounds[:, 1] - lat_min) / cell_size
+            # Moore Neighborhood
+            offsets = [(dc, dr) for dc in (-1, 0, 1) for dr in (-1, 0, 1) if (dc, dr) != (0, 0)]
+            odd_row_offsets = None
+
+        if not (np.allclose(cols, np.rint(cols), atol=1e-6) and np.allclose(rows, np.rint(rows), atol=1e-6)):
+            return None
+        return GenericGridAdjacencyMatrix.offset_adjacency_matrix(np.rint(cols), np.rint(rows), offsets, odd_row_offsets, sparse=True)
+    
+    
+    def get_grid_and_adj_matrix(self, hexagonal = False, sparse = False):
         if hexagonal:
             grid = self.create_hex_grid()
         else:
@@ -294,7 +572,12 @@ class Polygon:
             print("Grid creation failed or returned an empty geopandas dataframe.")
             return None, None
         
-        adj_df = self.calculate_adjacency_matrix(grid)
+        # Grids built here lie on a regular lattice, so the geometry tests are only needed as a fallback
+        adj_matrix = self.lattice_adjacency_matrix(grid, hexagonal=hexagonal)
+        if adj_matrix is None:
+            adj_df = self.calculate_adjacency_matrix(grid, sparse=sparse)
+        else:
+            adj_df = adj_matrix if sparse else to_dense_df(adj_matrix)
         return grid, adj_df
 
 #polygon_grid = Polygon(shapefile_path = None, grid_size = 3, US = True, stateabrev = ['AZ'])
@@ -31,23 +31,38 @@ class RunThroughSpike:
         """
         Executes the Spike Petri Net simulator based on the given mode.
         """
-        if self.continuous:
-            try:
-                # Execute the Spike command for continuous simulation
-                command = "spike exe -f=continuous.spc"
-                subprocess.run(command, shell=True)
-            except Exception as e:
-                print("RunThroughSpike: cannot find SBML/ANDL files. Error:", e)
-                return None
-        
-        elif self.stochastic:
-            try:
-                # Execute the Spike command for stochastic simulation
-                command = "spike exe -f=stochastic.spc"
-                subprocess.run(command, shell=True)
-            except Exception as e:
-                print("RunThroughSpike: cannot find SBML/ANDL files. Error:", e)
-                return None
+        spc_file = "continuous.spc" if self.continuous else "stochastic.spc"
+        try:
+            # Execute the Spike command for continuous or stochastic simulation
+            return _run_spike(spc_file)
+        except Exception as e:
+            print("RunThroughSpike: cannot find SBML/ANDL files. Error:", e)
+            return None
+
+    @staticmethod
+    def run_spike_simulations(spc_files, processes=None):
+        """
+        Executes several Spike simulations in parallel, one Spike process per configuration file.
+
+        Args:
+            spc_files (list): Spike configuration files (e.g. one per parameter configuration).
+            processes (int): Number of simulations to run at once (default: number of CPUs).
+
+        Returns:
+            list: Return codes of the Spike processes, in the order of spc_files. A failing run does not stop the others.
+        """
+        # Each Spike run is a single-threaded process, so runs scale with the number of cores
+        with Pool(processes=processes) as pool:
+            return pool.map(_run_spike, spc_files)
+
+
+def _run_spike(spc_file):
+    """
+    Runs Spike on one configuration file and returns its return code (nonzero if the run failed).
+    """
+    # Passing the arguments as a list runs Spike directly, without starting a shell first.
+    # Spike's output is not captured, so it still streams to the console as it runs
+    return subprocess.run(["spike", "exe", f"-f={spc_file}"]).returncode
 
 # Example usage:
 # spike_runner = RunThroughSpike("path/to/spike_file", continuous=True, stochastic=False)
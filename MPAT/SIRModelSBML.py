@@ -1,5 +1,12 @@
-import numpy as np
-import xml.etree.ElementTree as ET
+import os
+import functools
+import scipy.sparse
+from multiprocessing import Pool
+# lxml (libxml2) builds and serializes large SBML trees faster; the standard library ElementTree is the fallback
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 # Import classes from other files
 from HyperParameters import HyperParameters
@@ -19,6 +26,7 @@ class SIRModelSBML:
     - add_parameter: Add a parameter to the SBML model.
     - add_initial_assignment: Add an initial assignment to the SBML model.
     - add_reaction: Add a reaction to the SBML model.
+    - write: Write the SBML model to a file, optionally streaming extra reactions.
     """
     
     def __init__(self):
@@ -82,11 +90,11 @@ class SIRModelSBML:
 
         Args:
         - symbol (str): Symbol for the initial assignment.
-        - math_content (str): MathML content defining the assignment.
+        - math_content (str or Element): MathML content defining the assignment, as a string or an already built element.
         """
         initial_assignment = ET.SubElement(self.list_of_initial_assignments, "initialAssignment", symbol=symbol)
         math = ET.SubElement(initial_assignment, "math", xmlns="http://www.w3.org/1998/Math/MathML")
-        math.append(ET.fromstring(math_content))  # Parse MathML from string and append
+        math.append(_as_math_element(math_content))  # Parse MathML from string (if needed) and append
 
     def add_reaction(self, reaction_id, reversible="false", reactants=None, products=None, kinetic_law_math=None):
         """
@@ -97,26 +105,40 @@ class SIRModelSBML:
         - reversible (str): Whether the reaction is reversible (default: "false").
         - reactants (dict): Dictionary of reactants {species_id: stoichiometry}.
         - products (dict): Dictionary of products {species_id: stoichiometry}.
-        - kinetic_law_math (str): MathML content defining the kinetic law.
+        - kinetic_law_math (str or Element): MathML content defining the kinetic law, as a string or an already built element.
         """
-        reaction = ET.SubElement(self.list_of_reactions, "reaction", id=reaction_id, reversible=reversible, fast="false")
+        self.list_of_reactions.append(_make_reaction(reaction_id, reversible, reactants, products, kinetic_law_math))
 
-        # Add reactants
-        if reactants:
-            list_of_reactants = ET.SubElement(reaction, "listOfReactants")
-            for species_id, stoichiometry in reactants.items():
-                ET.SubElement(list_of_reactants, "speciesReference", species=species_id, stoichiometry=str(stoichiometry), constant="true")
-
-        # Add products
-        if products:
-            list_of_products = ET.SubElement(reaction, "listOfProducts")
-            for species_id, stoichiometry in products.items():
-                ET.SubElement(list_of_products, "speciesReference", species=species_id, stoichiometry=str(stoichiometry), constant="true")
+    def write(self, file_path, reactions=None):
+        """
+        Write the SBML model to a file.
 
-        # Create kinetic law with MathML
-        kinetic_law = ET.SubElement(reaction, "kineticLaw")
-        math = ET.SubElement(kinetic_law, "math", xmlns="http://www.w3.org/1998/Math/MathML")
-        math.append(ET.fromstring(kinetic_law_math))  # Parse MathML from string and append
+        Args:
+        - file_path (str): Path of the SBML file to write.
+        - reactions (iterable): Additional reaction elements (see _make_reaction) written after the reactions already in the model (default: None).
+          With lxml they are streamed to the file one at a time, so they are never all held in memory.
+        """
+        if reactions is None or not hasattr(ET, "xmlfile"):
+            # Standard library ElementTree: add the reactions to the tree while it is written at once
+            number_of_reactions = len(self.list_of_reactions)
+            self.list_of_reactions.extend(reactions or ())
+            ET.ElementTree(self.root).write(file_path, encoding="UTF-8", xml_declaration=True, method="xml")
+            del self.list_of_reactions[number_of_reactions:] # the model is left as it was
+            return
+
+        with ET.xmlfile(file_path, encoding="UTF-8") as xf:
+            xf.write_declaration()
+            with xf.element(self.root.tag, self.root.attrib):
+                with xf.element(self.model.tag, self.model.attrib):
+                    for element in self.model:
+                        if element is not self.list_of_reactions:
+                            xf.write(element)
+                            continue
+                        with xf.element(element.tag, element.attrib):
+                            for reaction in element:
+                                xf.write(reaction)
+                            for reaction in reactions:
+                                xf.write(reaction) # each reaction is released once written
 
         
 
@@ -138,9 +160,9 @@ class SIRModelSBML:
             try: 
                 # Call from polygon
                 polygon_grid = Polygon("cb_2023_us_county_500k.shp", grid_size = 10, US = True, stateabrev = ['AZ'])
-                grid, adj_matrix = polygon_grid.get_grid_and_adj_matrix(hexagonal=False)
-                number_of_patches = len(adj_matrix.values[0])
-                adjacency_matrix = adj_matrix.values
+                grid, adj_matrix = polygon_grid.get_grid_and_adj_matrix(hexagonal=False, sparse=True)
+                number_of_patches = adj_matrix.shape[0]
+                adjacency_matrix = adj_matrix
         
             except FileNotFoundError:
                 print("Shapefile not found.")
@@ -151,9 +173,9 @@ class SIRModelSBML:
             try:
                 # Call adjacency
                 adj_matrix = Adjacency(adjacency_file, US=True, stateabrev=['TX'])
-                adjacency_matrix = adj_matrix.generate_adjacency_matrix()
-                number_of_patches = len(adj_matrix.values[0])
-                adjacency_matrix = adj_matrix.values
+                adjacency_matrix = adj_matrix.generate_adjacency_matrix(sparse=True)
+                number_of_patches = len(adjacency_matrix)
+                adjacency_matrix = scipy.sparse.csr_matrix(adjacency_matrix.sparse.to_coo())
             
             except FileNotFoundError:
                 print("Adjacency matrix file not found.")
@@ -163,81 +185,241 @@ class SIRModelSBML:
             return None
 
         
+        # Neighbors of each patch (1-based) are read once from the CSR row slices (sorted, so reactions keep the patch order)
+        adjacency_matrix.sort_indices()
+        neighbors = [(adjacency_matrix.indices[adjacency_matrix.indptr[p]:adjacency_matrix.indptr[p + 1]] + 1).tolist() for p in range(number_of_patches)]
+
         # Initial values conditions
         #I0_value = np.arange(0, 100, 99)
         #R0_value = np.arange(0, 100, 99)
         #S0_value = np.arange(0, 100, 99)
     
-        if model_type == "SIR":
-            # If model type is SIR
-            for i in range(number_of_configurations):
-                sir_model = SIRModelSBML() # Calls the creation of SBML file
-                for patch_num in range(1, number_of_patches + 1): # goes through each of the patch/grid cells
-                    compartment_id = f"compartment{patch_num}"
-                    sir_model.add_compartment(compartment_id, spatial_dimensions="3", size="1", constant="true")
-                    for species_type in ["S", "I", "R"]:
-                        species_id = f"{species_type}{patch_num}" # Specify each place as patchnum
-                        IC = str(S0_value[i]) if species_type == "S" else str(I0_value[i]) if species_type == "I" else str(R0_value[i])
-                        sir_model.add_species(species_id, name=species_id, compartment=compartment_id, initial_concentration=IC)
-                    
-                    species_ids = [species.get('id') for species in species_list]
-
-                    for param_name, param_value in [(f"beta_{patch_num}", beta_value[i]), (f"gamma_{patch_num}", gamma_value[i]), (f"delta_{patch_num}", delta_value[i])]:
-                        sir_model.add_parameter(param_name, name=param_name, value=str(param_value), constant="true")
-                    for state_var in ["S", "I", "R"]:
-                        initial_assignment_symbol = f"{state_var}{patch_num}"
-                        sir_model.add_initial_assignment(initial_assignment_symbol, f"<ci>{state_var}0</ci>")
-                    # Add kinetic law reactions for the given parameters based on patch num
-                    kinetic_law_reaction_1 = f"<apply><times/><ci>gamma_{patch_num}</ci><ci>I{patch_num}</ci></apply>"  # need to comeback and specify the beta, gamma, and delta for each patch
-                    kinetic_law_reaction_2 = f"<apply><times/><ci>beta_{patch_num}</ci><ci>S{patch_num}</ci><ci>I{patch_num}</ci></apply>" # need to comeback and specify the beta, gamma, and delta for each patch
-
-                    sir_model.add_reaction(f"R_{patch_num}_I", reactants={f"I{patch_num}": 1}, products={f"R{patch_num}": 1}, kinetic_law_math=kinetic_law_reaction_1)
-                    sir_model.add_reaction(f"R_{patch_num}_R", reactants={f"S{patch_num}": 1, f"I{patch_num}": 1}, products={f"I{patch_num}": 2}, kinetic_law_math=kinetic_law_reaction_2)
-
-                    for neighbor_patch in np.where(adjacency_matrix[patch_num - 1] == 1)[0] + 1:
-                        kinetic_law_reaction_between_patches_Susceptibles = f"<apply><times/><ci>beta_{patch_num}</ci><ci>delta_{patch_num}</ci><ci>S{patch_num}</ci></apply>"
-                        kinetic_law_reaction_between_patches_Infected = f"<apply><times/><ci>beta_{patch_num}</ci><ci>delta_{patch_num}</ci><ci>I{patch_num}</ci></apply>"
-                        sir_model.add_reaction(f"R_{patch_num}_{neighbor_patch}_I", reactants={f"I{patch_num}": 1}, products={f"I{neighbor_patch}": 1}, kinetic_law_math=kinetic_law_reaction_between_patches_Infected)
-                        sir_model.add_reaction(f"R_{patch_num}_{neighbor_patch}", reactants={f"S{patch_num}": 1}, products={f"S{neighbor_patch}": 1}, kinetic_law_math=kinetic_law_reaction_between_patches_Susceptibles)
-
-                tree = ET.ElementTree(sir_model.root)
-                tree.write(f"SIR_MOC_Multi_{i}.xml", encoding="UTF-8", xml_declaration=True, method="xml")
-
-        elif model_type == "SEIR":
-            for i in range(number_of_configurations):
-                sir_model = SIRModelSBML() 
-                for patch_num in range(1, number_of_patches + 1):
-                    compartment_id = f"compartment{patch_num}"
-                    sir_model.add_compartment(compartment_id, spatial_dimensions="3", size="1", constant="true")
-
-                    for species_type in ["S", "E", "I", "R"]: # added the Exposed 
-                        species_id = f"{species_type}{patch_num}" 
-                        IC = str(S0_value[i]) if species_type == "S" else str(E0_value[i]) if species_type == "E" else str(I0_value[i]) if species_type == "I" else str(R0_value[i])
-
-                    for param_name, param_value in [(f"beta_{patch_num}", beta_value[i]), (f"gamma_{patch_num}", gamma_value[i]), (f"delta_{patch_num}", delta_value[i])]:
-                        sir_model.add_parameter(param_name, name=param_name, value=str(param_value), constant="true")
-
-                    for state_var in ["S", "E", "I", "R"]:
-                        initial_assignment_symbol = f"{state_var}{patch_num}"
-                        sir_model.add_initial_assignment(initial_assignment_symbol, f"<ci>{state_var}0</ci>")
-
-                    kinetic_law_reaction_1 = f"<apply><times/><ci>gamma_{patch_num}</ci><ci>I{patch_num}</ci></apply>"
-                    kinetic_law_reaction_2 = f"<apply><times/><ci>beta_{patch_num}</ci><ci>S{patch_num}</ci><ci>I{patch_num}</ci></apply>"
-                    kinetic_law_reaction_3 = f"<apply><times/><ci>nu_{patch_num}</ci><ci>E{patch_num}</ci></apply>"
-    
-                    sir_model.add_reaction(f"R_{patch_num}_1", reactants={f"I{patch_num}": 1}, products={f"R{patch_num}": 1}, kinetic_law_math=kinetic_law_reaction_1)
-                    sir_model.add_reaction(f"R_{patch_num}_2", reactants={f"S{patch_num}": 1, f"I{patch_num}": 1}, products={f"I{patch_num}": 1, f"E{patch_num}": 1}, kinetic_law_math=kinetic_law_reaction_2)
-                    sir_model.add_reaction(f"I_{patch_num}_3", reactants={f"E{patch_num}": 1}, products={f"I{patch_num}": 1}, kinetic_law_math=kinetic_law_reaction_3)
-            
-                    # reactions and kinetic laws BETWEEN patches
-                    for neighbor_patch in np.where(adjacency_matrix[patch_num - 1] == 1)[0] + 1:
-                        kinetic_law_reaction_between_patches_Susceptibles = f"<apply><times/><ci>beta_{patch_num}</ci><ci>delta_{patch_num}</ci><ci>S{patch_num}</ci></apply>"
-                        kinetic_law_reaction_between_patches_Infected = f"<apply><times/><ci>beta_{patch_num}</ci><ci>delta</ci><ci>I{patch_num}</ci></apply>"
-                        sir_model.add_reaction(f"R_{patch_num}_{neighbor_patch}_I", reactants={f"I{patch_num}": 1}, products={f"I{neighbor_patch}": 1}, kinetic_law_math=kinetic_law_reaction_between_patches_Infected)
-                        sir_model.add_reaction(f"R_{patch_num}_{neighbor_patch}", reactants={f"S{patch_num}": 1}, products={f"S{neighbor_patch}": 1}, kinetic_law_math=kinetic_law_reaction_between_patches_Susceptibles)
+        if model_type not in ("SIR", "SEIR"):
+            print("Invalid model type. Supported types: 'SIR', 'SEIR'")
+            return None
 
+        # Every configuration is an independent SBML file, so they are built in parallel processes
+        # (ElementTree holds the GIL, so threads would not help)
+        # The model shape is shared by all configurations, so it is sent to each worker once rather than with every task
+        configurations = [(i,
+                           (S0_value[i], E0_value[i] if model_type == "SEIR" else None, I0_value[i], R0_value[i]),
+                           (beta_value[i], gamma_value[i], delta_value[i]))
+                          for i in range(number_of_configurations)]
+        with Pool(processes=os.cpu_count(), initializer=_init_worker, initargs=(model_type, number_of_patches, neighbors)) as pool:
+            pool.map(_build_one_config, configurations)
 
-                tree = ET.ElementTree(sir_model.root)
-                tree.write("SEIR_MOC_Multi.xml", encoding="UTF-8", xml_declaration=True, method="xml")
-        else:
-            print("Invalid model type. Supported types: 'SIR', 'SEIR'")
+
+def _as_math_element(math_content):
+    """
+    Return MathML content as an element, parsing it only if it is given as a string.
+    """
+    return math_content if ET.iselement(math_content) else ET.fromstring(math_content)
+
+
+def _make_reaction(reaction_id, reversible="false", reactants=None, products=None, kinetic_law_math=None):
+    """
+    Build a reaction element, not yet attached to a model (see SIRModelSBML.add_reaction for the arguments).
+    """
+    reaction = ET.Element("reaction", id=reaction_id, reversible=reversible, fast="false")
+
+    # Add reactants
+    if reactants:
+        list_of_reactants = ET.SubElement(reaction, "listOfReactants")
+        for species_id, stoichiometry in reactants.items():
+            ET.SubElement(list_of_reactants, "speciesReference", species=species_id, stoichiometry=str(stoichiometry), constant="true")
+
+    # Add products
+    if products:
+        list_of_products = ET.SubElement(reaction, "listOfProducts")
+        for species_id, stoichiometry in products.items():
+            ET.SubElement(list_of_products, "speciesReference", species=species_id, stoichiometry=str(stoichiometry), constant="true")
+
+    # Create kinetic law with MathML
+    kinetic_law = ET.SubElement(reaction, "kineticLaw")
+    math = ET.SubElement(kinetic_law, "math", xmlns="http://www.w3.org/1998/Math/MathML")
+    math.append(_as_math_element(kinetic_law_math))  # Parse MathML from string (if needed) and append
+    return reaction
+
+
+def _make_ci_math(name):
+    """
+    Build the MathML element <ci>name</ci> directly, without parsing a string.
+    """
+    ci = ET.Element("ci")
+    ci.text = name
+    return ci
+
+
+def _make_times_math(*ci_names):
+    """
+    Build the MathML product <apply><times/><ci>A</ci><ci>B</ci>...</apply> directly, without parsing a string.
+    """
+    apply = ET.Element("apply")
+    ET.SubElement(apply, "times")
+    for name in ci_names:
+        ET.SubElement(apply, "ci").text = name
+    return apply
+
+
+@functools.lru_cache(maxsize=None)
+def _patch_ids(number_of_patches):
+    """
+    ID strings of every patch (compartments, species, and parameters), built once per number of patches.
+
+    Args:
+    - number_of_patches (int): Number of patches/grid cells.
+
+    Returns:
+    - dict: Lists of IDs by kind (e.g. ids["S"][patch_num - 1] is "S{patch_num}").
+    """
+    prefixes = {"compartment": "compartment", "S": "S", "E": "E", "I": "I", "R": "R",
+                "beta": "beta_", "gamma": "gamma_", "delta": "delta_", "nu": "nu_"}
+    return {kind: [f"{prefix}{patch_num}" for patch_num in range(1, number_of_patches + 1)] for kind, prefix in prefixes.items()}
+
+
+@functools.lru_cache(maxsize=1)
+def _model_skeleton(model_type, number_of_patches):
+    """
+    Model with every compartment, species, parameter, and initial assignment of the patches, but no reactions.
+    Species concentrations and parameter values are placeholders that _build_one_config fills in for each configuration,
+    so the skeleton is built once per worker process and reused across its configurations.
+
+    Args:
+    - model_type (str): Type of the model ("SIR" or "SEIR").
+    - number_of_patches (int): Number of patches/grid cells.
+    """
+    ids = _patch_ids(number_of_patches)
+    sir_model = SIRModelSBML() # Calls the creation of SBML file
+    if model_type == "SIR":
+        # If model type is SIR
+        for patch_num in range(1, number_of_patches + 1): # goes through each of the patch/grid cells
+            p = patch_num - 1
+            compartment_id = ids["compartment"][p]
+            sir_model.add_compartment(compartment_id, spatial_dimensions="3", size="1", constant="true")
+            for species_type in ["S", "I", "R"]:
+                species_id = ids[species_type][p] # Specify each place as patchnum
+                sir_model.add_species(species_id, name=species_id, compartment=compartment_id, initial_concentration="0")
+
+            for param_name in [ids["beta"][p], ids["gamma"][p], ids["delta"][p]]:
+                sir_model.add_parameter(param_name, name=param_name, value="0", constant="true")
+            for state_var in ["S", "I", "R"]:
+                sir_model.add_initial_assignment(ids[state_var][p], _make_ci_math(f"{state_var}0"))
+
+    elif model_type == "SEIR":
+        for patch_num in range(1, number_of_patches + 1):
+            p = patch_num - 1
+            compartment_id = ids["compartment"][p]
+            sir_model.add_compartment(compartment_id, spatial_dimensions="3", size="1", constant="true")
+
+            for species_type in ["S", "E", "I", "R"]: # added the Exposed 
+                species_id = ids[species_type][p] 
+
+            for param_name in [ids["beta"][p], ids["gamma"][p], ids["delta"][p]]:
+                sir_model.add_parameter(param_name, name=param_name, value="0", constant="true")
+
+            for state_var in ["S", "E", "I", "R"]:
+                sir_model.add_initial_assignment(ids[state_var][p], _make_ci_math(f"{state_var}0"))
+    return sir_model
+
+
+# Model shape shared by every configuration a worker process builds, set once by _init_worker
+_worker_model = None
+
+
+def _init_worker(model_type, number_of_patches, neighbors):
+    """
+    Store the model shape in a worker process.
+
+    Args:
+    - model_type (str): Type of the model ("SIR" or "SEIR").
+    - number_of_patches (int): Number of patches.
+    - neighbors (list): neighbors[patch_num - 1] lists the neighboring patch numbers of each patch.
+    """
+    global _worker_model
+    _worker_model = (model_type, number_of_patches, neighbors)
+
+
+def _build_one_config(configuration):
+    """
+    Build and write the SBML model of one parameter configuration, for the model shape set by _init_worker.
+
+    Args:
+    - configuration (tuple): (i, (S0, E0, I0, R0), (beta, gamma, delta)) for configuration i.
+    """
+    model_type, number_of_patches, neighbors = _worker_model
+    i, initial_values, parameter_values = configuration
+    S0, E0, I0, R0 = initial_values
+    beta, gamma, delta = parameter_values
+
+    # Every ID and value string is formatted once (IDs once per worker process), not inside the patch loop
+    ids = _patch_ids(number_of_patches)
+    IC = {"S": str(S0), "E": str(E0), "I": str(I0), "R": str(R0)}
+    values = {"beta": str(beta), "gamma": str(gamma), "delta": str(delta)}
+
+    # Only the values differ between configurations, so they are set on the shared skeleton in place
+    # (each worker writes one configuration at a time)
+    sir_model = _model_skeleton(model_type, number_of_patches)
+    for species in sir_model.list_of_species:
+        species.set("initialConcentration", IC[species.get("id")[0]]) # species IDs are the type followed by the patch number
+    for parameter in sir_model.list_of_parameters:
+        parameter.set("value", values[parameter.get("id").split("_")[0]])
+
+    # Reactions are the bulk of the model, so they are generated patch by patch while the file is written
+    # One file per configuration, since the configurations are written concurrently
+    if model_type == "SIR":
+        sir_model.write(f"SIR_MOC_Multi_{i}.xml", reactions=_sir_reactions(ids, number_of_patches, neighbors))
+    elif model_type == "SEIR":
+        sir_model.write(f"SEIR_MOC_Multi_{i}.xml", reactions=_seir_reactions(ids, number_of_patches, neighbors))
+
+
+def _sir_reactions(ids, number_of_patches, neighbors):
+    """
+    Generate the reactions of the SIR model, patch by patch.
+
+    Args:
+    - ids (dict): Patch ID tables from _patch_ids.
+    - number_of_patches (int): Number of patches/grid cells.
+    - neighbors (list): Neighboring patch numbers of each patch (neighbors[patch_num - 1]).
+    """
+    for patch_num in range(1, number_of_patches + 1):
+        p = patch_num - 1
+        S_id, I_id, R_id = ids["S"][p], ids["I"][p], ids["R"][p]
+        beta_id, gamma_id, delta_id = ids["beta"][p], ids["gamma"][p], ids["delta"][p]
+
+        # Add kinetic law reactions for the given parameters based on patch num
+        kinetic_law_reaction_1 = _make_times_math(gamma_id, I_id)  # need to comeback and specify the beta, gamma, and delta for each patch
+        kinetic_law_reaction_2 = _make_times_math(beta_id, S_id, I_id) # need to comeback and specify the beta, gamma, and delta for each patch
+
+        yield _make_reaction(f"R_{patch_num}_I", reactants={I_id: 1}, products={R_id: 1}, kinetic_law_math=kinetic_law_reaction_1)
+        yield _make_reaction(f"R_{patch_num}_R", reactants={S_id: 1, I_id: 1}, products={I_id: 2}, kinetic_law_math=kinetic_law_reaction_2)
+
+        for neighbor_patch in neighbors[p]:
+            kinetic_law_reaction_between_patches_Susceptibles = _make_times_math(beta_id, delta_id, S_id)
+            kinetic_law_reaction_between_patches_Infected = _make_times_math(beta_id, delta_id, I_id)
+            yield _make_reaction(f"R_{patch_num}_{neighbor_patch}_I", reactants={I_id: 1}, products={ids["I"][neighbor_patch - 1]: 1}, kinetic_law_math=kinetic_law_reaction_between_patches_Infected)
+            yield _make_reaction(f"R_{patch_num}_{neighbor_patch}", reactants={S_id: 1}, products={ids["S"][neighbor_patch - 1]: 1}, kinetic_law_math=kinetic_law_reaction_between_patches_Susceptibles)
+
+
+def _seir_reactions(ids, number_of_patches, neighbors):
+    """
+    Generate the reactions of the SEIR model, patch by patch (same arguments as _sir_reactions).
+    """
+    for patch_num in range(1, number_of_patches + 1):
+        p = patch_num - 1
+        S_id, E_id, I_id, R_id = ids["S"][p], ids["E"][p], ids["I"][p], ids["R"][p]
+        beta_id, gamma_id, delta_id, nu_id = ids["beta"][p], ids["gamma"][p], ids["delta"][p], ids["nu"][p]
+
+        kinetic_law_reaction_1 = _make_times_math(gamma_id, I_id)
+        kinetic_law_reaction_2 = _make_times_math(beta_id, S_id, I_id)
+        kinetic_law_reaction_3 = _make_times_math(nu_id, E_id)
+
+        yield _make_reaction(f"R_{patch_num}_1", reactants={I_id: 1}, products={R_id: 1}, kinetic_law_math=kinetic_law_reaction_1)
+        yield _make_reaction(f"R_{patch_num}_2", reactants={S_id: 1, I_id: 1}, products={I_id: 1, E_id: 1}, kinetic_law_math=kinetic_law_reaction_2)
+        yield _make_reaction(f"I_{patch_num}_3", reactants={E_id: 1}, products={I_id: 1}, kinetic_law_math=kinetic_law_reaction_3)
+
+        # reactions and kinetic laws BETWEEN patches
+        for neighbor_patch in neighbors[p]:
+            kinetic_law_reaction_between_patches_Susceptibles = _make_times_math(beta_id, delta_id, S_id)
+            kinetic_law_reaction_between_patches_Infected = _make_times_math(beta_id, "delta", I_id)
+            yield _make_reaction(f"R_{patch_num}_{neighbor_patch}_I", reactants={I_id: 1}, products={ids["I"][neighbor_patch - 1]: 1}, kinetic_law_math=kinetic_law_reaction_between_patches_Infected)
+            yield _make_reaction(f"R_{patch_num}_{neighbor_patch}", reactants={S_id: 1}, products={ids["S"][neighbor_patch - 1]: 1}, kinetic_law_math=kinetic_law_reaction_between_patches_Susceptibles)
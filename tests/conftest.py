@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+# The MPAT modules import each other by module name, and load their data files relative to the working directory
+MPAT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "MPAT")
+sys.path.insert(0, MPAT_DIR)
+
+
+@pytest.fixture
+def in_mpat_dir(monkeypatch):
+    # Run from MPAT so that the bundled shapefiles and lookup tables are found
+    monkeypatch.chdir(MPAT_DIR)
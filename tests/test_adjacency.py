@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import shapely
+
+from GenericGridAdjacencyMatrix import GenericGridAdjacencyMatrix
+
+# Same neighborhood as Polygon.lattice_adjacency_matrix uses for hexagonal grids
+HEX_OFFSETS = [(0, 2), (0, -2), (0, 1), (0, -1), (-1, 1), (-1, -1)]
+HEX_ODD_ROW_OFFSETS = [(0, 2), (0, -2), (0, 1), (0, -1), (1, 1), (1, -1)]
+
+
+def test_offset_adjacency_matrix_keeps_row_parity_when_lowest_row_is_odd():
+    cols, rows = np.meshgrid(np.arange(4), np.arange(7), indexing='ij')
+    cols, rows = cols.ravel(), rows.ravel()
+    full = GenericGridAdjacencyMatrix.offset_adjacency_matrix(cols, rows, HEX_OFFSETS, HEX_ODD_ROW_OFFSETS)
+
+    # Without row 0 the lowest row is odd; the remaining cells keep their neighbors
+    keep = rows >= 1
+    subset = GenericGridAdjacencyMatrix.offset_adjacency_matrix(cols[keep], rows[keep], HEX_OFFSETS, HEX_ODD_ROW_OFFSETS)
+    np.testing.assert_array_equal(subset, full[np.ix_(keep, keep)])
+
+
+def _shared_edge_pairs(grid):
+    # Ground truth: cells are neighbors when their boundaries share a segment of positive length
+    geoms = np.asarray(grid.geometry.values)
+    eps = np.sqrt(np.median(shapely.area(geoms))) * 1e-6
+    i, j = shapely.STRtree(geoms).query(geoms, predicate='dwithin', distance=eps)
+    i, j = i[i < j], j[i < j]
+    shared = shapely.length(shapely.intersection(shapely.buffer(shapely.boundary(geoms[i]), eps), shapely.boundary(geoms[j])))
+    return set(zip(i[shared > 100 * eps].tolist(), j[shared > 100 * eps].tolist()))
+
+
+def test_hex_lattice_adjacency_matches_shared_edges_when_lowest_row_is_odd(in_mpat_dir):
+    pytest.importorskip("geopandas")
+    from Polygon import Polygon
+
+    # The overlap filter drops an odd number of bottom hexagon rows for Utah at this grid size
+    polygon = Polygon(None, 400, US=True, stateabrev=['UT'])
+    grid = polygon.create_hex_grid()
+    adj_matrix = polygon.lattice_adjacency_matrix(grid, hexagonal=True).tocoo()
+
+    pairs = set((i, j) for i, j in zip(adj_matrix.row.tolist(), adj_matrix.col.tolist()) if i < j)
+    assert pairs == _shared_edge_pairs(grid)
@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+
+from CSVFileReader import CSVFileReader
+
+
+def test_lazy_reader_requires_a_cached_frame():
+    with pytest.raises(ValueError):
+        CSVFileReader(".", lazy=True, max_cached=0)
+
+
+def test_lazy_reader_evicts_least_recently_used(tmp_path):
+    for name in ("a", "b", "c"):
+        pd.DataFrame({"x": [1, 2]}).to_csv(tmp_path / f"{name}.csv", sep=';', index=False)
+    reader = CSVFileReader(str(tmp_path), lazy=True, max_cached=1)
+    reader.read_csv_files_to_dataframe()
+
+    for index in range(3):
+        assert list(reader.get_dataframe_by_index(index)['x']) == [1, 2]
+        assert len(reader.dataframes) == 1
@@ -0,0 +1,17 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+
+
+def test_csv_is_the_same_with_and_without_pyarrow(tmp_path, monkeypatch):
+    import HyperParameters as hyper_parameters_module
+    from HyperParameters import HyperParameters
+
+    # Whole, small and noisy values, which the two writers format differently by default
+    hyper_params = HyperParameters([0, 1, 2.5e-7], [0.2], [0.1], [1, 2, 3], 2, start_noise_at=2, noise_std=1e-3, seed=0)
+    beta_tensors, _, _ = hyper_params.generate_and_save_tensors(save_csv=False)
+
+    hyper_params.save_tensor_as_csv(beta_tensors, tmp_path / "pyarrow.csv")
+    monkeypatch.setattr(hyper_parameters_module, "pa", None)
+    hyper_params.save_tensor_as_csv(beta_tensors, tmp_path / "pandas.csv")
+    assert (tmp_path / "pyarrow.csv").read_bytes() == (tmp_path / "pandas.csv").read_bytes()
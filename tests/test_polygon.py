@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("geopandas")
+
+
+@pytest.mark.parametrize("state, grid_size, number_of_cells", [("RI", 20, 25), ("TX", 50, 39)])
+def test_square_grid_keeps_last_column_with_overlap(in_mpat_dir, state, grid_size, number_of_cells):
+    from Polygon import Polygon
+
+    # Cell counts of the original grid; rounding in the float step used to drop the column on the eastern bound
+    grid = Polygon(None, grid_size, US=True, stateabrev=[state]).create_grid()
+    assert len(grid) == number_of_cells
+    assert list(grid['ID']) == list(range(1, number_of_cells + 1))
+
+
+def test_read_shapefile_accepts_gdal_paths(in_mpat_dir, tmp_path):
+    import zipfile
+    from Polygon import read_shapefile
+
+    # Zipped shapefiles are not paths on disk, but the reader opens them
+    archive = tmp_path / "counties.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for extension in ("shp", "shx", "dbf", "prj", "cpg"):
+            zf.write(f"cb_2023_us_county_500k.{extension}")
+    assert len(read_shapefile(f"zip://{archive}")) == len(read_shapefile("cb_2023_us_county_500k.shp"))
+
+
+def test_read_shapefile_missing_file_raises_file_not_found(tmp_path):
+    from Polygon import read_shapefile
+
+    with pytest.raises(FileNotFoundError):
+        read_shapefile(str(tmp_path / "missing.shp"))
+
+
+def test_state_filtered_polygon_reports_missing_shapefile(tmp_path, monkeypatch):
+    import os
+    import shutil
+    import Polygon as polygon_module
+    from Polygon import Polygon
+
+    # The lookup table is there but the county shapefile is not
+    shutil.copy(os.path.join(os.path.dirname(polygon_module.__file__), "State_Names.json"), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    assert Polygon(None, 10, US=True, stateabrev=['AZ']).gdf is None
+
+
+def test_polygon_cache_follows_the_working_directory(in_mpat_dir, tmp_path, monkeypatch):
+    from Polygon import Polygon
+
+    # Loaded from MPAT first, so a cache keyed only on the relative name would return these counties
+    assert Polygon(None, 10, US=True, stateabrev=['RI']).gdf is not None
+    monkeypatch.chdir(tmp_path)
+    assert Polygon(None, 10, US=True, stateabrev=['RI']).gdf is None
+
+
+def test_read_json_cache_follows_the_working_directory(tmp_path, monkeypatch):
+    from Polygon import _read_json
+
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "table.json").write_text('{"name": "%s"}' % name)
+        monkeypatch.chdir(tmp_path / name)
+        assert _read_json("table.json") == {"name": name}